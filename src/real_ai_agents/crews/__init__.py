@@ -9,12 +9,30 @@ This package contains the three main crews for the real estate workflow:
 Each crew outputs JSON files that are consumed by the next phase via Flow @listen decorators.
 """
 
-from real_ai_agents.crews.research_crew.research_crew import ResearchCrew
-from real_ai_agents.crews.location_analyzer_crew.location_analyzer_crew import LocationAnalyzerCrew
-from real_ai_agents.crews.call_agent_crew.call_agent_crew import CallAgentCrew
+import importlib
+
+# Crew classes are imported on first attribute access (PEP 562), so starting
+# the Flow does not pay for every crew's tools and SDK clients up front.
+_CREW_MODULES = {
+    "ResearchCrew": "real_ai_agents.crews.research_crew.research_crew",
+    "LocationAnalyzerCrew": "real_ai_agents.crews.location_analyzer_crew.location_analyzer_crew",
+    "CallAgentCrew": "real_ai_agents.crews.call_agent_crew.call_agent_crew",
+}
 
 __all__ = [
     "ResearchCrew",
     "LocationAnalyzerCrew", 
     "CallAgentCrew",
 ]
+
+
+def __getattr__(name):
+    if name in _CREW_MODULES:
+        crew_class = getattr(importlib.import_module(_CREW_MODULES[name]), name)
+        globals()[name] = crew_class
+        return crew_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
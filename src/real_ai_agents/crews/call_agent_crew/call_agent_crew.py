@@ -1,27 +1,27 @@
+from functools import lru_cache
 from typing import List
-import os
 
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.project import CrewBase, agent, crew, task
 
+from real_ai_agents.llms import llm_default, llm_fast, llm_reasoner
+from real_ai_agents.settings import ENABLE_MEMORY, PROD
+from real_ai_agents.tools.redis_tool_cache import RedisToolCache
+from real_ai_agents.tools.report_writer import report_writer
 from real_ai_agents.tools.retell_tools import (
     make_inspection_call,
     make_negotiation_call,
+    make_inspection_calls_batch,
+    make_negotiation_calls_batch,
     get_call_result,
     check_call_status,
 )
 
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-
-llm = LLM(
-    model="openrouter/deepseek/deepseek-chat",
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY,
-    temperature=0.1,
-)
-
+@lru_cache(maxsize=1)
+def tool_cache() -> RedisToolCache:  # Retell results shared across workers
+    return RedisToolCache()
 
 
 @CrewBase
@@ -45,8 +45,8 @@ class CallAgentCrew:
         """Manager agent that coordinates call routing."""
         return Agent(
             config=self.agents_config["manager"],  # type: ignore[index]
-            verbose=True,
-            llm=llm,
+            verbose=not PROD,
+            llm=llm_fast(max_tokens=512),  # Routing decisions
             max_iter=8,
             cache=True,
         )
@@ -56,13 +56,12 @@ class CallAgentCrew:
         """Inspector agent for booking property viewings (rent/buy intent)."""
         return Agent(
             config=self.agents_config["inspector"],  # type: ignore[index]
-            verbose=True,
-            llm=llm,
+            verbose=not PROD,
+            llm=llm_default(),
             max_iter=10,
-            max_rpm=10,
             cache=True,
-            max_retry_limit=3,
-            tools=[make_inspection_call, get_call_result, check_call_status],
+            cache_handler=tool_cache(),
+            tools=[make_inspection_call, make_inspection_calls_batch, get_call_result, check_call_status],
         )
 
     @agent
@@ -72,13 +71,12 @@ class CallAgentCrew:
             config=self.agents_config["negotiator"],  # type: ignore[index]
             reasoning=True,  # Enable reasoning for complex persuasion strategies
             max_reasoning_attempts=3,
-            verbose=True,
-            llm=llm,
+            verbose=not PROD,
+            llm=llm_reasoner(max_tokens=4096),
             max_iter=10,
-            max_rpm=10,
             cache=True,
-            max_retry_limit=3,
-            tools=[make_negotiation_call, get_call_result, check_call_status],
+            cache_handler=tool_cache(),
+            tools=[make_negotiation_call, make_negotiation_calls_batch, get_call_result, check_call_status],
         )
 
     @agent
@@ -86,8 +84,8 @@ class CallAgentCrew:
         """Report agent that compiles call results to JSON."""
         return Agent(
             config=self.agents_config["report_agent"],  # type: ignore[index]
-            verbose=True,
-            llm=llm,
+            verbose=not PROD,
+            llm=llm_fast(max_tokens=8192),  # Full transcripts need the headroom
             max_iter=5,
             cache=True,
         )
@@ -118,7 +116,7 @@ class CallAgentCrew:
         """Task to compile all call results into JSON report."""
         return Task(
             config=self.tasks_config["compile_call_report"],  # type: ignore[index]
-            output_file="output/call_results.json",
+            callback=report_writer("output/call_results.json"),
         )
 
     @crew
@@ -128,8 +126,10 @@ class CallAgentCrew:
             agents=self.agents,
             tasks=self.tasks,
             process=Process.hierarchical,
-            manager_llm=llm,
-            memory=True,
-            planning=True,  # Enable planning for call strategy
-            verbose=True,
+            manager_llm=llm_fast(max_tokens=512),
+            cache=False,  # Keep each agent's cache_handler instead of one shared dict
+            memory=ENABLE_MEMORY,
+            planning=len(self.tasks) > 3,  # A planning pass only pays off on longer task lists
+            stream=True,
+            verbose=not PROD,
         )
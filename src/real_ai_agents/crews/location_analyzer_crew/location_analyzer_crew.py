@@ -1,20 +1,66 @@
-from typing import List, Tuple, Any
-import os
+from typing import Dict, List, Optional, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 import json
 
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.project import CrewBase, agent, crew, task
 from crewai.tasks.task_output import TaskOutput
 
-from ..tools.google_maps_tools import google_places_geocode_tool, google_places_nearby_tool
+from real_ai_agents.llms import llm_default, llm_fast
+from real_ai_agents.settings import ENABLE_MEMORY, PROD, REASONING
+from real_ai_agents.tools.google_maps_tools import google_places_geocode_tool, google_places_nearby_tool
+from real_ai_agents.tools.report_writer import report_writer
 
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-
 
 # ============== GUARDRAILS ==============
 
+def _location_analysis_errors(data: Dict[str, Any]) -> List[str]:
+    """Return the schema problems in one property's location analysis."""
+    required_amenities = [
+        "markets", "gyms", "bus_parks", "railway_terminals",
+        "stadiums", "malls", "airports", "seaports"
+    ]
+    
+    errors = []
+    
+    # Check property_id
+    if not data.get("property_id"):
+        errors.append("Missing property_id")
+    
+    # Check coordinates
+    coords = data.get("coordinates")
+    if not isinstance(coords, dict) or not coords.get("lat") or not coords.get("lng"):
+        errors.append("Missing coordinates (lat/lng)")
+    
+    # Check all amenity categories exist
+    amenities = data.get("amenities")
+    if not isinstance(amenities, dict):
+        errors.append("Missing or invalid amenities object")
+        amenities = {}
+    for amenity in required_amenities:
+        if amenity not in amenities:
+            errors.append(f"Missing amenity category: {amenity}")
+        else:
+            # Each amenity should have a score
+            if not isinstance(amenities[amenity], dict) or "score" not in amenities[amenity]:
+                errors.append(f"Missing score for {amenity}")
+    
+    # Check overall_score
+    if "overall_score" not in data:
+        errors.append("Missing overall_score")
+    
+    # Check advantages and disadvantages
+    if "advantages" not in data or not isinstance(data.get("advantages"), list):
+        errors.append("Missing or invalid advantages array")
+    if "disadvantages" not in data or not isinstance(data.get("disadvantages"), list):
+        errors.append("Missing or invalid disadvantages array")
+    
+    return errors
+
+
 def validate_location_analysis(result: TaskOutput) -> Tuple[bool, Any]:
     """Validate that location analysis contains all 8 amenity categories and required fields."""
     try:
@@ -27,41 +73,7 @@ def validate_location_analysis(result: TaskOutput) -> Tuple[bool, Any]:
         else:
             data = result.raw
         
-        required_amenities = [
-            "markets", "gyms", "bus_parks", "railway_terminals",
-            "stadiums", "malls", "airports", "seaports"
-        ]
-        
-        errors = []
-        
-        # Check property_id
-        if not data.get("property_id"):
-            errors.append("Missing property_id")
-        
-        # Check coordinates
-        coords = data.get("coordinates", {})
-        if not coords.get("lat") or not coords.get("lng"):
-            errors.append("Missing coordinates (lat/lng)")
-        
-        # Check all amenity categories exist
-        amenities = data.get("amenities", {})
-        for amenity in required_amenities:
-            if amenity not in amenities:
-                errors.append(f"Missing amenity category: {amenity}")
-            else:
-                # Each amenity should have a score
-                if "score" not in amenities[amenity]:
-                    errors.append(f"Missing score for {amenity}")
-        
-        # Check overall_score
-        if "overall_score" not in data:
-            errors.append("Missing overall_score")
-        
-        # Check advantages and disadvantages
-        if "advantages" not in data or not isinstance(data.get("advantages"), list):
-            errors.append("Missing or invalid advantages array")
-        if "disadvantages" not in data or not isinstance(data.get("disadvantages"), list):
-            errors.append("Missing or invalid disadvantages array")
+        errors = _location_analysis_errors(data)
         
         if errors:
             return (False, "Validation failed:\n" + "\n".join(errors))
@@ -107,25 +119,79 @@ def validate_location_report(result: TaskOutput) -> Tuple[bool, Any]:
     except Exception as e:
         return (False, f"Validation error: {str(e)}")
 
-llm = LLM(
-    model="openrouter/deepseek/deepseek-chat",
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY,
-    temperature=0.1,
-)
+
+# ============== BATCH ANALYSIS ==============
+
+# Google place types searched for each amenity category (as listed in tasks.yaml)
+AMENITY_PLACE_TYPES = {
+    "markets": ("grocery_store", "supermarket"),
+    "gyms": ("gym", "fitness_center"),
+    "bus_parks": ("bus_station", "transit_station"),
+    "railway_terminals": ("train_station", "subway_station", "light_rail_station"),
+    "stadiums": ("stadium",),
+    "malls": ("shopping_mall",),
+    "airports": ("airport",),
+    "seaports": ("ferry_terminal",),
+}
+
+ANALYSIS_TOKENS_PER_PROPERTY = 1200  # One analysis JSON object is ~900 tokens
+MAX_BATCH_TOKENS = 8192  # DeepSeek output cap
+
+
+def _prefetch_location_data(prop: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the Maps lookups the analyzer agent would make for one property."""
+    address = prop.get("address") or prop.get("location") or ""
+    data = {"property": prop, "api_errors": []}
+
+    try:
+        geocode = google_places_geocode_tool.run(address=address)
+    except Exception as e:
+        data["api_errors"].append(f"geocode: {str(e)}")
+        return data
+
+    data["geocode"] = geocode
+    if not geocode.get("success"):
+        return data
+
+    data["nearby"] = {}
+    for category, place_types in AMENITY_PLACE_TYPES.items():
+        places = {}
+        for place_type in place_types:
+            try:
+                results = google_places_nearby_tool.run(
+                    latitude=geocode["latitude"],
+                    longitude=geocode["longitude"],
+                    category=place_type,
+                )
+            except Exception as e:
+                data["api_errors"].append(f"{category} ({place_type}): {str(e)}")
+                continue
+            # A place can carry several types (a grocery_store that is also a supermarket)
+            for place in results:
+                places.setdefault(place.get("place_id") or place.get("name"), place)
+        data["nearby"][category] = sorted(places.values(), key=lambda p: p.get("distance_meters", 0))
+    return data
+
+
+def _parse_batch_response(raw: str) -> Dict[str, Any]:
+    """Parse the id-keyed JSON object, tolerating a ```json fence."""
+    text = raw.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1].rsplit("```", 1)[0]
+    return json.loads(text)
 
 
 @CrewBase
 class LocationAnalyzerCrew:
-    """Location Analyzer Crew - Hierarchical process for geospatial analysis.
+    """Location Analyzer Crew - Per-property geospatial analysis.
     
     This crew handles the Intelligence Phase:
-    - Manager assigns approved properties (max 6) to analyzer agents
-    - Each analyzer handles ALL 8 amenity types for one property
-    - Analyzers work in parallel using async_execution
-    - Report agent compiles results to JSON
-    
-    Process: Hierarchical - Manager coordinates parallel property analysis.
+    - analyze_properties_batch() analyzes all approved properties (max 6) in
+      one LLM request from prefetched Maps data
+    - crew() analyzes ONE property with live tool calls; the Flow uses it with
+      kickoff_for_each_async for any property the batch could not cover
+    - Each run covers ALL 8 amenity types for its property
+    - report_crew() compiles the collected analyses to JSON
     
     Amenity Types (6km radius, 50km for airports):
     - Markets, Gyms, Bus parks, Railway terminals
@@ -139,103 +205,17 @@ class LocationAnalyzerCrew:
     tasks_config = "config/tasks.yaml"
 
     @agent
-    def manager(self) -> Agent:
-        """Manager agent that coordinates property assignments."""
-        return Agent(
-            config=self.agents_config["manager"],  # type: ignore[index]
-            verbose=True,
-            llm=llm,
-            max_iter=8,
-            cache=True,
-        )
-
-    @agent
-    def location_analyzer_1(self) -> Agent:
-        """Location analyzer for property 1."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
-
-    @agent
-    def location_analyzer_2(self) -> Agent:
-        """Location analyzer for property 2."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
-
-    @agent
-    def location_analyzer_3(self) -> Agent:
-        """Location analyzer for property 3."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
-
-    @agent
-    def location_analyzer_4(self) -> Agent:
-        """Location analyzer for property 4."""
+    def location_analyzer(self) -> Agent:
+        """Location analyzer for a single property."""
         return Agent(
             config=self.agents_config["location_analyzer"],  # type: ignore[index]
             respect_context_window=True,
-            verbose=True,
-            llm=llm,
+            reasoning=REASONING,  # Opt-in: doubles LLM calls for a structured lookup
+            max_reasoning_attempts=2,
+            verbose=not PROD,
+            llm=llm_default(),  # One analyze_property JSON object is ~900 tokens
             max_iter=6,
-            max_rpm=15,
             cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
-
-    @agent
-    def location_analyzer_5(self) -> Agent:
-        """Location analyzer for property 5."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
-            tools=[google_places_geocode_tool, google_places_nearby_tool],
-        )
-
-    @agent
-    def location_analyzer_6(self) -> Agent:
-        """Location analyzer for property 6."""
-        return Agent(
-            config=self.agents_config["location_analyzer"],  # type: ignore[index]
-            respect_context_window=True,
-            verbose=True,
-            llm=llm,
-            max_iter=6,
-            max_rpm=15,
-            cache=True,
-            max_retry_limit=3,
             tools=[google_places_geocode_tool, google_places_nearby_tool],
         )
 
@@ -244,81 +224,18 @@ class LocationAnalyzerCrew:
         """Report agent that compiles location intelligence to JSON."""
         return Agent(
             config=self.agents_config["report_agent"],  # type: ignore[index]
-            verbose=True,
-            llm=llm,
+            verbose=not PROD,
+            llm=llm_fast(),
             max_iter=5,
             cache=True,
         )
 
     @task
-    def assign_properties(self) -> Task:
-        """Task for manager to assign properties to analyzers."""
-        return Task(
-            config=self.tasks_config["assign_properties"],  # type: ignore[index]
-        )
-
-    @task
-    def analyze_property_1(self) -> Task:
-        """Async task for analyzer 1."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_1(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_2(self) -> Task:
-        """Async task for analyzer 2."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_2(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_3(self) -> Task:
-        """Async task for analyzer 3."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_3(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_4(self) -> Task:
-        """Async task for analyzer 4."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_4(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_5(self) -> Task:
-        """Async task for analyzer 5."""
-        return Task(
-            config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_5(),
-            async_execution=True,
-            guardrail=validate_location_analysis,
-            guardrail_max_retries=2,
-        )
-
-    @task
-    def analyze_property_6(self) -> Task:
-        """Async task for analyzer 6."""
+    def analyze_property(self) -> Task:
+        """Task to analyze the property passed in as {property}."""
         return Task(
             config=self.tasks_config["analyze_property"],  # type: ignore[index]
-            agent=self.location_analyzer_6(),
-            async_execution=True,
+            agent=self.location_analyzer(),
             guardrail=validate_location_analysis,
             guardrail_max_retries=2,
         )
@@ -328,22 +245,90 @@ class LocationAnalyzerCrew:
         """Task to compile all location analysis into JSON report."""
         return Task(
             config=self.tasks_config["compile_location_report"],  # type: ignore[index]
-            output_file="output/location_intelligence.json",
+            callback=report_writer("output/location_intelligence.json"),
             guardrail=validate_location_report,
             guardrail_max_retries=2,
         )
 
     @crew
     def crew(self) -> Crew:
-        """Creates the Location Analyzer Crew with hierarchical process."""
+        """Creates the per-property analysis crew, run once per property via kickoff_for_each."""
         return Crew(
-            agents=self.agents,
-            tasks=self.tasks,
-            process=Process.hierarchical,
-            manager_agent=self.manager(),
-            memory=True,
-            planning=True,
-            verbose=True,
-            
+            agents=[self.location_analyzer()],
+            tasks=[self.analyze_property()],
+            process=Process.sequential,
+            memory=ENABLE_MEMORY,
+            stream=True,
+            verbose=not PROD,
         )
 
+    def report_crew(self) -> Crew:
+        """Creates the crew that compiles {location_analyses} into the final report."""
+        return Crew(
+            agents=[self.report_agent()],
+            tasks=[self.compile_location_report()],
+            process=Process.sequential,
+            memory=ENABLE_MEMORY,
+            stream=True,
+            verbose=not PROD,
+        )
+
+    def analyze_properties_batch(self, properties: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Analyze every property in a single LLM request.
+        
+        The Maps lookups are prefetched in Python, so the model only scores and
+        summarises. Returns one analysis JSON string per property, in order;
+        None marks a property that should be re-run through crew().
+        """
+        if not properties:
+            return []
+
+        ids = [str(p.get("id") or f"prop_{i + 1:03d}") for i, p in enumerate(properties)]
+        with ThreadPoolExecutor(max_workers=len(properties)) as pool:
+            location_data = list(pool.map(_prefetch_location_data, properties))
+
+        agent_config = self.agents_config["location_analyzer"]  # type: ignore[index]
+        task_config = self.tasks_config["analyze_property"]  # type: ignore[index]
+        blocks = "\n".join(
+            f'<property id="{pid}">\n{json.dumps(data, default=str)}\n</property>'
+            for pid, data in zip(ids, location_data)
+        )
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    f"You are {agent_config['role'].strip()}. {agent_config['backstory'].strip()}\n"
+                    f"Your personal goal is: {agent_config['goal'].strip()}"
+                ),
+            },
+            {
+                "role": "user",
+                "content": (
+                    task_config["description"].replace("{property}", blocks)
+                    + "\nThe geocode and nearby-search results for each property are already "
+                    "in its <property> block; use them instead of calling any tools.\n"
+                    "For each property, emit a JSON object keyed by id. Each value must match:\n"
+                    + task_config["expected_output"]
+                    + "\nReturn only the JSON object keyed by id."
+                ),
+            },
+        ]
+
+        llm = copy(llm_default())
+        llm.max_tokens = min(ANALYSIS_TOKENS_PER_PROPERTY * len(properties), MAX_BATCH_TOKENS)
+        try:
+            batch = _parse_batch_response(llm.call(messages))
+        except Exception as e:
+            # Context-length errors, a malformed reply, or any failure crewai.LLM's
+            # streaming path re-raises as a plain Exception
+            print(f"⚠️ Batch location analysis failed, falling back to per-property runs: {e}")
+            return [None] * len(properties)
+
+        analyses = []
+        for pid in ids:
+            analysis = batch.get(pid) if isinstance(batch, dict) else None
+            if isinstance(analysis, dict) and not _location_analysis_errors(analysis):
+                analyses.append(json.dumps(analysis))
+            else:
+                analyses.append(None)
+        return analyses
@@ -1,19 +1,22 @@
 import os
 import re
 import json
+from functools import lru_cache
 from typing import List, Tuple, Any
 
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.project import CrewBase, agent, crew, task
 from crewai.tasks.hallucination_guardrail import HallucinationGuardrail
 from crewai.tasks.task_output import TaskOutput
 from crewai_tools import TavilySearchTool
+from real_ai_agents.llms import OPENROUTER_BASE_URL, http_client, llm_fast, llm_reasoner
+from real_ai_agents.settings import ENABLE_MEMORY, PROD
+from real_ai_agents.tools.report_writer import report_writer
+from real_ai_agents.tools.throttled_llm import ThrottledLLM
 from real_ai_agents.tools.tinyfish_tools import TinyFishExtractorTool
 
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-
 
 # ============== GUARDRAILS ==============
 
@@ -116,7 +119,7 @@ def validate_property_extraction(result: TaskOutput) -> Tuple[bool, Any]:
                 missing.append("property_description")
             
             # Check image URL
-            image = prop.get("image_url") or prop.get("images")
+            image = prop.get("image_url") or prop.get("image_urls") or prop.get("images")
             if not image:
                 missing.append("image_url")
             
@@ -137,20 +140,19 @@ def validate_property_extraction(result: TaskOutput) -> Tuple[bool, Any]:
         return (False, f"Validation error: {str(e)}")
 
 
-# HallucinationGuardrail for validate_data task
-hallucination_guardrail = HallucinationGuardrail(
-    llm=LLM(model="openrouter/openai/gpt-4o-mini", base_url="https://openrouter.ai/api/v1", api_key=os.getenv("OPENROUTER_API_KEY")),
-    context="Property data extracted from real estate listing websites. All information must be directly from scraped content.",
-    threshold=7.0  # Require 7+ faithfulness score
-)
-
-llm = LLM(
-    model="openrouter/deepseek/deepseek-r1",
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY,
-    temperature=0.1,
-    #stream=True
-)
+# HallucinationGuardrail for extract_and_validate_data task
+@lru_cache(maxsize=1)
+def hallucination_guardrail() -> HallucinationGuardrail:
+    return HallucinationGuardrail(
+        llm=ThrottledLLM(
+            model="openrouter/openai/gpt-4o-mini",
+            base_url=OPENROUTER_BASE_URL,
+            api_key=os.getenv("OPENROUTER_API_KEY"),
+            client=http_client(),
+        ),
+        context="Property data extracted from real estate listing websites. All information must be directly from scraped content.",
+        threshold=7.0  # Require 7+ faithfulness score
+    )
 
 
 tavily_search = TavilySearchTool(
@@ -168,9 +170,9 @@ class ResearchCrew:
     
     This crew handles the Deep Discovery phase:
     1. Scraper - Finds listings on real estate platforms
-    2. TinyFish Extractor - Extracts structured property data via AI browser
-    3. Validator - Ensures data quality
-    4. Report Agent - Compiles JSON for Human Decision Gate
+    2. Extractor/Validator - Extracts structured property data via AI browser
+       and scores its quality in the same pass
+    3. Report Agent - Compiles JSON for Human Decision Gate
     
     Process: Sequential - Each step depends on the previous output.
     """
@@ -186,46 +188,34 @@ class ResearchCrew:
         """Scraper agent that finds property listings."""        
         return Agent(
             config=self.agents_config["scraper"],  # type: ignore[index]
-            verbose=True,
-            llm=llm,
-            max_rpm=10,
+            verbose=not PROD,
+            llm=llm_reasoner(),
             max_iter=6,
             cache=True, 
             respect_context_window=True, 
-            max_retry_limit=3,
             tools=[tavily_search],
         )
 
     @agent
-    def tinyfish_extractor(self) -> Agent:
-        """TinyFish extractor agent that visits listing URLs and extracts structured property data."""
+    def extractor_validator(self) -> Agent:
+        """Extractor agent that pulls listing data via TinyFish and self-validates it."""
         return Agent(
-            config=self.agents_config["tinyfish_extractor"],  # type: ignore[index]
+            config=self.agents_config["extractor_validator"],  # type: ignore[index]
             verbose=False,
             respect_context_window=True,
             max_iter=6,
-            llm=llm,
+            llm=llm_reasoner(),
             tools=[tinyfish_extractor],
         )
 
-    @agent
-    def validator(self) -> Agent:
-        """Validator agent that ensures data quality."""
-        return Agent(
-            config=self.agents_config["validator"],  # type: ignore[index]
-            verbose=True,
-            max_iter=3,
-            llm=llm 
-        )
-
     @agent
     def report_agent(self) -> Agent:
         """Report agent that compiles results to JSON."""
         return Agent(
             config=self.agents_config["report_agent"],  # type: ignore[index]
-            verbose=True,
+            verbose=not PROD,
             max_iter=5,
-            llm=llm 
+            llm=llm_fast(),
         )
 
     @task
@@ -238,30 +228,20 @@ class ResearchCrew:
         )
 
     @task
-    def extract_property_data(self) -> Task:
-        """Task to extract structured data from raw listings."""
+    def extract_and_validate_data(self) -> Task:
+        """Task to extract structured data from raw listings and score its quality."""
         return Task(
-            config=self.tasks_config["extract_property_data"],  # type: ignore[index]
-            guardrail=validate_property_extraction,
+            config=self.tasks_config["extract_and_validate_data"],  # type: ignore[index]
+            guardrails=[validate_property_extraction, hallucination_guardrail()],
             guardrail_max_retries=3,
         )
 
-    @task
-    def validate_data(self) -> Task:
-        """Task to validate extracted property data."""
-        return Task(
-            config=self.tasks_config["validate_data"],  # type: ignore[index]
-            guardrail=hallucination_guardrail,
-            guardrail_max_retries=2,
-        )
-
-
     @task
     def compile_research_report(self) -> Task:
         """Task to compile validated data into JSON report."""
         return Task(
             config=self.tasks_config["compile_research_report"],  # type: ignore[index]
-            output_file="output/research_results.json",
+            callback=report_writer("output/research_results.json"),
         )
 
     @crew
@@ -271,8 +251,8 @@ class ResearchCrew:
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            memory=True,
+            memory=ENABLE_MEMORY,
             stream=True,
-            planning=True,  
-            verbose=True,
+            planning=len(self.tasks) > 3,  # A planning pass only pays off on longer task lists
+            verbose=not PROD,
         )
\ No newline at end of file
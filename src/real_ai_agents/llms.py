@@ -0,0 +1,78 @@
+"""
+Shared OpenRouter LLMs for all crews.
+
+Each tier is built once per max_tokens cap and reused by every crew, and all
+of them send requests through one pooled HTTP client, so the parallel crews
+reuse keep-alive connections to openrouter.ai instead of each opening their
+own. HTTP/2 multiplexing is used when the h2 package is installed.
+
+LiteLLM's OpenRouter handler ignores litellm.client_session, so the client
+is handed to every completion through LiteLLM's per-call `client` parameter.
+"""
+
+import importlib.util
+import os
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+import litellm
+from litellm.llms.custom_httpx.http_handler import HTTPHandler
+
+from real_ai_agents.tools.cached_llm import CachedLLM
+from real_ai_agents.tools.throttled_llm import record_rate_limit_headers
+
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# HTTP/2 support - install with: pip install httpx[http2]
+HTTP2 = importlib.util.find_spec("h2") is not None
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+
+
+@lru_cache(maxsize=1)
+def http_client() -> HTTPHandler:
+    """The pooled OpenRouter client shared by every LLM in the process."""
+    return HTTPHandler(client=httpx.Client(
+        limits=HTTP_LIMITS,
+        http2=HTTP2,
+        timeout=httpx.Timeout(litellm.request_timeout, connect=5.0),
+        event_hooks={"response": [record_rate_limit_headers]},
+    ))
+
+
+def _openrouter_llm(model: str, providers: list, max_tokens: Optional[int]) -> CachedLLM:
+    return CachedLLM(
+        model=model,
+        base_url=OPENROUTER_BASE_URL,
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        temperature=0.1,
+        max_tokens=max_tokens,
+        stream=True,
+        extra_body={"provider": {"order": providers, "allow_fallbacks": True}},
+        client=http_client(),
+    )
+
+
+@lru_cache(maxsize=None)
+def llm_fast(max_tokens: Optional[int] = 4096) -> CachedLLM:
+    """Gemini Flash - routing decisions and JSON report assembly."""
+    return _openrouter_llm(
+        "openrouter/google/gemini-2.5-flash", ["Google AI Studio", "Google Vertex"], max_tokens
+    )
+
+
+@lru_cache(maxsize=None)
+def llm_default(max_tokens: Optional[int] = 2048) -> CachedLLM:
+    """DeepSeek V3 - tool-calling analysis steps."""
+    return _openrouter_llm(
+        "openrouter/deepseek/deepseek-chat", ["DeepSeek", "Fireworks"], max_tokens
+    )
+
+
+@lru_cache(maxsize=None)
+def llm_reasoner(max_tokens: Optional[int] = None) -> CachedLLM:
+    """DeepSeek R1 - multi-step reasoning. R1 spends part of max_tokens on reasoning tokens."""
+    return _openrouter_llm(
+        "openrouter/deepseek/deepseek-r1", ["DeepSeek", "Fireworks"], max_tokens
+    )
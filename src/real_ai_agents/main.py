@@ -1,18 +1,28 @@
 #!/usr/bin/env python
 """AI Real Estate Agent Flow - Find, Approve & Act"""
 
+import ast
+import io
 import json
+import re
+import time
 import asyncio
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, Field
 from crewai.flow.flow import Flow, listen, start, or_
 from crewai.flow.persistence import persist
 from crewai.flow.human_feedback import human_feedback, HumanFeedbackResult
 
-from real_ai_agents.crews.research_crew.research_crew import ResearchCrew
-from real_ai_agents.crews.call_agent_crew.call_agent_crew import CallAgentCrew
-from real_ai_agents.crews.location_analyzer_crew.location_analyzer_crew import LocationAnalyzerCrew
+# Streaming JSON parser - install with: pip install ijson
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from real_ai_agents import crews  # Crew modules load on first use
+from real_ai_agents.tools.report_writer import flush_reports, strip_fences
 
 
 # ========================= STATE =========================
@@ -26,13 +36,28 @@ class SearchCriteria(BaseModel):
     rent_frequency: str = "monthly"
     additional_requirements: Optional[str] = None
 
+    def search_query(self) -> str:
+        """One-line query for the research crew, e.g. '2 bedroom apartment in Lagos (monthly rent)'."""
+        parts = [
+            str(self.bedrooms) if self.bedrooms else "",
+            f"bedroom {self.property_type} in {self.location}",
+            f"under {self.max_price}" if self.max_price else "",
+            f"({self.rent_frequency} rent)",
+        ]
+        return " ".join(p for p in parts if p)
+
 
 class RealEstateState(BaseModel):
     search_criteria: Optional[SearchCriteria] = None
+    search_query: Optional[str] = None  # Built once from search_criteria
     approved_property_ids: List[str] = []
     retry_count: int = 0
 
     research_results: Optional[str] = None
+    # research_results, parsed once. Left out of model_dump so @persist and the
+    # per-step flow events don't serialize the research payload twice; after a
+    # restore it is None and the steps fall back to research_results.
+    research_data: Optional[Dict[str, Any]] = Field(default=None, exclude=True)
     filtered_research_results: Optional[str] = None
     location_results: Optional[str] = None
     call_results: Optional[str] = None
@@ -41,9 +66,156 @@ class RealEstateState(BaseModel):
     properties_approved: int = 0
 
 
+# ========================= STREAMING =========================
+
+def _report_prompt_cache(label: str, result) -> None:
+    """Print how much of the crew's prompt traffic was served from the provider cache."""
+    usage = result.token_usage
+    if usage.prompt_tokens:
+        ratio = usage.cached_prompt_tokens / usage.prompt_tokens
+        print(f"🗄️ {label} prompt cache hit: {ratio:.0%} of {usage.prompt_tokens} prompt tokens")
+
+
+async def _adrain_stream(streaming, label: str):
+    """Consume a streaming crew run and return every CrewOutput (kickoff_for_each yields several)."""
+    started = time.perf_counter()
+    async for _ in streaming:
+        if started is not None:
+            print(f"⚡ {label} first token after {time.perf_counter() - started:.2f}s")
+            started = None
+    for result in streaming.results:
+        _report_prompt_cache(label, result)
+    return streaming.results
+
+
+async def _tagged(tag: str, coro):
+    """Await coro and return (tag, result), so as_completed callers know which leg finished."""
+    return tag, await coro
+
+
+def _parsed_output(raw: Optional[str]) -> Any:
+    """A crew's JSON output as an object, or the raw text if it isn't JSON."""
+    if raw is None:
+        return None
+    try:
+        return orjson.loads(strip_fences(raw))
+    except orjson.JSONDecodeError:
+        return raw
+
+
+# ========================= FILTERING =========================
+
+LISTING_KEYS = ("properties", "listings")
+_JSON_OBJECT_START = re.compile(r"\s*\{")
+_ID_SEPARATORS = re.compile(r"[\s,\[\]'\"]+")
+_VALUE_END_EVENTS = {"null", "boolean", "integer", "double", "number", "string", "end_map", "end_array"}
+
+
+def _parse_approved_ids(feedback: str) -> List[str]:
+    """Parse approved ids from JSON, the Python-list form the prompt shows, or bare ids.
+
+    Bare input such as "prop_001" or "p1, p2" is split on commas and whitespace.
+    """
+    try:
+        ids = json.loads(feedback)
+    except json.JSONDecodeError:
+        try:
+            ids = ast.literal_eval(feedback)
+        except (ValueError, SyntaxError):
+            ids = None
+    if isinstance(ids, str):
+        return [ids]
+    if isinstance(ids, (list, tuple, set)):
+        return [str(i) for i in ids]
+    return [i for i in _ID_SEPARATORS.split(feedback) if i]
+
+
+def _select_approved(data: Dict[str, Any], approved: Set[str]) -> Tuple[Dict[str, Any], Optional[int]]:
+    """Shallow copy of parsed research data keeping only approved properties.
+
+    Every LISTING_KEYS array is filtered; the approved count is taken from the
+    first one present (None when there is none).
+    """
+    filtered = {
+        key: [p for p in data[key] if isinstance(p, dict) and p.get("id") in approved]
+        for key in LISTING_KEYS
+        if isinstance(data.get(key), list)
+    }
+    if not filtered:
+        return data, None
+    return {**data, **filtered}, _approved_count({key: len(kept) for key, kept in filtered.items()})
+
+
+def _approved_count(kept: Dict[str, int]) -> Optional[int]:
+    """Approved count from per-key kept counts: the first LISTING_KEYS array wins."""
+    return next((kept[key] for key in LISTING_KEYS if key in kept), None)
+
+
+def _filter_approved_listings(raw: str, approved: Set[str]) -> Tuple[str, Optional[int]]:
+    """Filter raw research JSON down to the approved properties.
+
+    Used when no parsed research_data is in state. With ijson the document
+    is walked token by token: top-level values are copied through and
+    listing items are built one at a time and dropped unless their id is
+    approved, so the full listing array is never held in memory. Returns the
+    filtered JSON and the approved count (None when there is no listing
+    array).
+    """
+    if ijson is None:
+        data, kept = _select_approved(orjson.loads(raw), approved)
+        return orjson.dumps(data).decode(), kept
+
+    encoder = json.JSONEncoder()
+    chunks: List[str] = []
+    kept: Dict[str, int] = {}
+    key = None
+    builder = None
+    items = None
+
+    def emit(name, value):
+        chunks.append("," if chunks else "{")
+        chunks.append(encoder.encode(name) + ":")
+        chunks.extend(encoder.iterencode(value))
+
+    for prefix, event, value in ijson.parse(io.BytesIO(raw.encode()), use_float=True):
+        if prefix == "":
+            if event == "map_key":
+                key = value
+            elif event not in ("start_map", "end_map"):
+                raise ValueError("Research results are not a JSON object")
+            continue
+
+        if items is None and builder is None and key in LISTING_KEYS and prefix == key and event == "start_array":
+            items = []
+            continue
+
+        if items is not None:
+            if builder is None:
+                if prefix == key and event == "end_array":
+                    emit(key, items)
+                    kept[key], items = len(items), None
+                    continue
+                builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            if prefix == f"{key}.item" and event in _VALUE_END_EVENTS:
+                item, builder = builder.value, None
+                if isinstance(item, dict) and item.get("id") in approved:
+                    items.append(item)
+            continue
+
+        if builder is None:
+            builder = ijson.ObjectBuilder()
+        builder.event(event, value)
+        if prefix == key and event in _VALUE_END_EVENTS:
+            emit(key, builder.value)
+            builder = None
+
+    return "".join(chunks or ["{"]) + "}", _approved_count(kept)
+
+
 # ========================= FLOW =========================
 
-@persist
+@persist()
 class RealEstateFlow(Flow[RealEstateState]):
 
     @start()
@@ -53,6 +225,7 @@ class RealEstateFlow(Flow[RealEstateState]):
         print("=" * 50)
 
         self.state.search_criteria = search_criteria
+        self.state.search_query = search_criteria.search_query()
 
         print(f"Location: {search_criteria.location}")
         print(f"Type: {search_criteria.property_type}")
@@ -64,30 +237,39 @@ class RealEstateFlow(Flow[RealEstateState]):
     # -------------------------
 
     @listen(initialize_search)
-    def run_research(self):
+    async def run_research(self):
         """Kick off ResearchCrew with user's search criteria."""
-        criteria = self.state.search_criteria
-
-        search_query = f"{criteria.bedrooms or ''} bedroom {criteria.property_type} in {criteria.location}"
-        if criteria.max_price:
-            search_query += f" under {criteria.max_price}"
-        search_query += f" ({criteria.rent_frequency} rent)"
+        search_query = self.state.search_query
+        print(f"\n🔍 Searching: {search_query}")
 
-        print(f"\n🔍 Searching: {search_query.strip()}")
+        # Imported here: the flow module stays free of the LLM stack until research starts
+        from real_ai_agents.tools.cached_llm import cache_scope
 
-        result = ResearchCrew().crew().kickoff(inputs={
-            "search_criteria": search_query.strip(),
-        })
+        # A user retry rejected the previous results, so its LLM turns must not be replayed
+        scope = cache_scope.set(f"research-retry-{self.state.retry_count}" if self.state.retry_count else "")
+        try:
+            # Crews are built per kickoff: agents and tasks hold per-kickoff state, so
+            # only their LLMs (llms.py) and tools are shared across concurrent flows
+            streaming = await crews.ResearchCrew().crew().kickoff_async(inputs={
+                "search_criteria": search_query,
+            })
+            (result,) = await _adrain_stream(streaming, "Research")
+        finally:
+            cache_scope.reset(scope)
 
         self.state.research_results = result.raw
 
-        try:
-            data = json.loads(result.raw)
-            key = "properties" if "properties" in data else "listings"
-            if key in data:
-                self.state.properties_found = len(data[key])
-        except Exception:
-            pass
+        # Only a JSON object is kept, so prose replies skip the parse (and its exception) entirely
+        self.state.research_data = None
+        if _JSON_OBJECT_START.match(result.raw):
+            try:
+                self.state.research_data = orjson.loads(result.raw)
+            except orjson.JSONDecodeError:
+                pass
+
+        # Count from the dict that is already parsed for filtering (a retry that returns no JSON counts 0)
+        data = self.state.research_data or {}
+        self.state.properties_found = len(data.get("properties") or data.get("listings") or [])
 
         print(f"✅ Found {self.state.properties_found} properties")
         return self.state.research_results
@@ -111,22 +293,22 @@ class RealEstateFlow(Flow[RealEstateState]):
     def filter_approved(self, result: HumanFeedbackResult):
         """Filter properties to only the ones the user approved."""
         try:
-            approved_ids = json.loads(result.feedback)
-            self.state.approved_property_ids = approved_ids
+            approved = set(_parse_approved_ids(result.feedback))
         except Exception:
-            self.state.approved_property_ids = []
+            approved = set()
+        self.state.approved_property_ids = sorted(approved)
 
         try:
-            data = json.loads(self.state.research_results)
-            key = "properties" if "properties" in data else "listings"
-            if key in data:
-                data[key] = [
-                    p for p in data[key]
-                    if p.get("id") in self.state.approved_property_ids
-                ]
-                self.state.properties_approved = len(data[key])
-
-            self.state.filtered_research_results = json.dumps(data)
+            if self.state.research_data is not None:
+                # dict() unwraps the flow's LockedDictProxy, which orjson would encode as {}
+                data, approved_count = _select_approved(dict(self.state.research_data), approved)
+                filtered = orjson.dumps(data).decode()
+            else:
+                filtered, approved_count = _filter_approved_listings(self.state.research_results, approved)
+            if approved_count is not None:
+                self.state.properties_approved = approved_count
+
+            self.state.filtered_research_results = filtered
         except Exception:
             self.state.filtered_research_results = self.state.research_results
 
@@ -153,20 +335,52 @@ class RealEstateFlow(Flow[RealEstateState]):
 
         print("\n🚀 Running Call Agent & Location Analyzer in parallel...")
 
-        call_task = asyncio.create_task(
-            CallAgentCrew().crew().kickoff_async(inputs=inputs)
-        )
-        location_task = asyncio.create_task(
-            LocationAnalyzerCrew().crew().kickoff_async(inputs=inputs)
-        )
+        call_stream = await crews.CallAgentCrew().crew().kickoff_async(inputs=inputs)
 
-        call_result, location_result = await asyncio.gather(call_task, location_task)
-
-        self.state.call_results = call_result.raw
-        self.state.location_results = location_result.raw
+        legs = [
+            asyncio.create_task(_tagged("call", _adrain_stream(call_stream, "Call Agent"))),
+            asyncio.create_task(_tagged("location", self._analyze_locations())),
+        ]
+        try:
+            # Store each crew's result as soon as it lands instead of waiting on the slower one
+            for finished in asyncio.as_completed(legs):
+                tag, result = await finished
+                if tag == "call":
+                    (call_result,) = result
+                    self.state.call_results = call_result.raw
+                    print("✅ Call Agent crew completed")
+                else:
+                    self.state.location_results = result.raw
+                    print("✅ Location Analyzer crew completed")
+        finally:
+            for leg in legs:
+                leg.cancel()
 
         print("✅ Both crews completed")
 
+    async def _analyze_locations(self):
+        """Analyze the approved properties in one batched request, then compile the report."""
+        data = orjson.loads(self.state.filtered_research_results)
+        properties = data.get("properties") or data.get("listings") or []
+
+        location_crew = crews.LocationAnalyzerCrew()
+        batched = await asyncio.to_thread(location_crew.analyze_properties_batch, properties)
+        analyses = [a for a in batched if a is not None]
+
+        # Properties the batch missed get the per-property agent with live tools
+        fallback = [p for p, a in zip(properties, batched) if a is None]
+        if fallback:
+            streaming = await location_crew.crew().kickoff_for_each_async(
+                inputs=[{"property": orjson.dumps(p).decode()} for p in fallback]
+            )
+            analyses += [r.raw for r in await _adrain_stream(streaming, "Location Analyzer")]
+
+        report_stream = await location_crew.report_crew().kickoff_async(inputs={
+            "location_analyses": "\n".join(analyses),
+        })
+        (report,) = await _adrain_stream(report_stream, "Location Report")
+        return report
+
     # -------------------------
     # FINAL REPORT
     # -------------------------
@@ -174,6 +388,24 @@ class RealEstateFlow(Flow[RealEstateState]):
     @listen(run_parallel_crews)
     def compile_final_report(self):
         """Compile unified report from all phases."""
+        flush_reports()  # Crew reports are written in the background
+
+        if self.state.properties_approved == 0:
+            # Nothing reached the call/location phases, so there is nothing to merge
+            final_report = {
+                "status": "no_approved",
+                "search_criteria": self.state.search_criteria.model_dump(),
+                "retries": self.state.retry_count,
+            }
+            with open("output/unified_report.json", "wb") as f:
+                f.write(orjson.dumps(final_report))
+            print("\n📋 No approved properties, summary saved to output/unified_report.json")
+            print("✅ Flow Complete")
+            return final_report
+
+        # self.state hands out lists and dicts as CrewAI's lock proxies, which
+        # orjson encodes from their empty builtin storage, so copy them out first
+        research_data = self.state.research_data
         final_report = {
             "search_criteria": self.state.search_criteria.model_dump(),
             "summary": {
@@ -181,16 +413,16 @@ class RealEstateFlow(Flow[RealEstateState]):
                 "properties_approved": self.state.properties_approved,
                 "retries": self.state.retry_count,
             },
-            "approved_property_ids": self.state.approved_property_ids,
+            "approved_property_ids": list(self.state.approved_property_ids),
             "phases": {
-                "research": self.state.research_results,
-                "calls": self.state.call_results,
-                "location": self.state.location_results,
+                "research": dict(research_data) if research_data else _parsed_output(self.state.research_results),
+                "calls": _parsed_output(self.state.call_results),
+                "location": _parsed_output(self.state.location_results),
             },
         }
 
-        with open("output/unified_report.json", "w") as f:
-            json.dump(final_report, f, indent=2)
+        with open("output/unified_report.json", "wb") as f:
+            f.write(orjson.dumps(final_report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
         print("\n📋 Final report saved to output/unified_report.json")
         print("✅ Flow Complete")
@@ -199,9 +431,20 @@ class RealEstateFlow(Flow[RealEstateState]):
 
 # ========================= ENTRY POINTS =========================
 
+async def kickoff_async():
+    """Run the flow on a loop with the eager task factory (Python 3.12+).
+
+    Eager tasks start running inside create_task, so a crew leg that can
+    finish without suspending never goes through the loop's scheduler.
+    """
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    await RealEstateFlow().kickoff_async()
+
+
 def kickoff():
     """Run the flow."""
-    RealEstateFlow().kickoff()
+    asyncio.run(kickoff_async())
 
 
 def plot():
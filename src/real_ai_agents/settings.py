@@ -0,0 +1,16 @@
+"""
+Runtime switches shared by the crews.
+
+ENV=prod turns off verbose agent/crew logging. ENABLE_MEMORY controls CrewAI
+memory (an embedding call and vector-store write after every step); it
+defaults to on outside production and off in it. CREWAI_REASONING=1 opts the
+bulk location analyzers into CrewAI's reflection pass (an extra LLM call per
+task); it is off by default.
+"""
+
+import os
+
+
+PROD = os.getenv("ENV") == "prod"
+ENABLE_MEMORY = os.getenv("ENABLE_MEMORY", "false" if PROD else "true").lower() == "true"
+REASONING = os.getenv("CREWAI_REASONING") == "1"
@@ -7,18 +7,37 @@ This module exports all custom tools used by the crews:
 - Google Maps tools for location analysis (Location Analyzer Crew) - TODO
 """
 
+import importlib
 
-from real_ai_agents.tools.retell_tools import (
-    make_inspection_call,
-    make_negotiation_call,
-    get_call_result,
-    check_call_status,
-)
+# Tools are imported on first attribute access (PEP 562), so importing a
+# helper module such as tools.report_writer does not load the Retell SDK.
+_TOOL_MODULES = {
+    "make_inspection_call": "real_ai_agents.tools.retell_tools",
+    "make_negotiation_call": "real_ai_agents.tools.retell_tools",
+    "make_inspection_calls_batch": "real_ai_agents.tools.retell_tools",
+    "make_negotiation_calls_batch": "real_ai_agents.tools.retell_tools",
+    "get_call_result": "real_ai_agents.tools.retell_tools",
+    "check_call_status": "real_ai_agents.tools.retell_tools",
+}
 
 __all__ = [
     # Retell AI Voice Call Tools
     "make_inspection_call",
     "make_negotiation_call",
+    "make_inspection_calls_batch",
+    "make_negotiation_calls_batch",
     "get_call_result",
     "check_call_status",
 ]
+
+
+def __getattr__(name):
+    if name in _TOOL_MODULES:
+        tool = getattr(importlib.import_module(_TOOL_MODULES[name]), name)
+        globals()[name] = tool
+        return tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,252 @@
+"""
+Response cache for the OpenRouter LLMs used by the crews.
+
+CachedLLM is a drop-in replacement for crewai.LLM. A completion is reused
+when the model, the agent role and every message of the prompt match a
+previous call exactly (a SHA-256 of the whole prompt is the key). At most
+MAX_CACHED_RESPONSES responses are kept, least recently used first out.
+
+Semantic matching is only used for short, data-free turns: when everything
+before the last message matches exactly and the last message fits in the
+embedding window of sentence-transformers/all-MiniLM-L6-v2 without
+carrying numbers (prices, addresses, ids), it is embedded and looked up in
+a FAISS inner-product index, and a stored response is returned when the
+cosine similarity clears SIMILARITY_THRESHOLD. Task prompts with
+interpolated listings or research results are always matched exactly.
+
+The cache is never read on a guardrail retry, since replaying the answer
+the guardrail just rejected would only fail it again. The flow sets
+cache_scope for each research attempt after a user "retry", so the rerun
+does not replay the turns of the results that were rejected.
+
+Requests that do go out are throttled by ThrottledLLM's shared rate
+limiter and mark the static system prompt and the task prompt with
+cache_control: {"type": "ephemeral"} so OpenRouter can serve the prefix
+from the provider's prompt cache.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from real_ai_agents.tools.throttled_llm import ThrottledLLM
+
+# Optional semantic lookup - install with: pip install sentence-transformers faiss-cpu
+# Without them the cache falls back to exact prompt matching.
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.95
+MAX_CACHED_RESPONSES = 1024
+MAX_SEMANTIC_PARTITIONS = 64
+MAX_PARTITION_ENTRIES = 256
+
+_DATA_PATTERN = re.compile(r"\d")
+
+
+class _Partition:
+    """Embedded last turns sharing one exact (model, agent, earlier turns) prefix."""
+
+    def __init__(self, dimension: int):
+        self.index = faiss.IndexFlatIP(dimension)
+        self.embeddings: List[Any] = []
+        self.responses: List[str] = []
+
+    def add(self, embedding, response: str) -> None:
+        self.embeddings.append(embedding)
+        self.responses.append(response)
+        if len(self.responses) > MAX_PARTITION_ENTRIES:
+            # IndexFlatIP cannot drop single vectors, so rebuild without the oldest
+            del self.embeddings[0], self.responses[0]
+            self.index.reset()
+            for kept in self.embeddings:
+                self.index.add(kept)
+        else:
+            self.index.add(embedding)
+
+
+# Extra cache-key component for the current context; responses cached under
+# one scope are never served in another
+cache_scope: ContextVar[str] = ContextVar("cache_scope", default="")
+
+_responses: "OrderedDict[str, str]" = OrderedDict()
+_partitions: "OrderedDict[str, _Partition]" = OrderedDict()
+_lock = threading.Lock()
+_encoder = None
+
+
+def _get_encoder():
+    """Load the sentence-transformers model once per process."""
+    global _encoder
+    if SentenceTransformer is None or faiss is None:
+        return None
+    if _encoder is None:
+        _encoder = SentenceTransformer(EMBEDDING_MODEL)
+    return _encoder
+
+
+def _mark_cacheable(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return a copy of messages with the system prompts and first user turn as cacheable content blocks.
+
+    The first user turn is the task prompt with its inputs (e.g. the research
+    results) interpolated, and the agent resends it unchanged on every
+    iteration, so it is the longest stable prefix after the system prompt.
+    """
+    marked = []
+    first_user = True
+    for message in messages:
+        role = message.get("role")
+        if isinstance(message.get("content"), str) and (role == "system" or (role == "user" and first_user)):
+            message = {
+                **message,
+                "content": [{
+                    "type": "text",
+                    "text": message["content"],
+                    "cache_control": {"type": "ephemeral"},
+                }],
+            }
+        if role == "user":
+            first_user = False
+        marked.append(message)
+    return marked
+
+
+def _content(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    return content if isinstance(content, str) else json.dumps(content, sort_keys=True)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value).encode()).hexdigest()
+
+
+def _semantic_text(message: Dict[str, Any]) -> Optional[str]:
+    """The text of a user turn that is safe to match semantically, else None.
+
+    Turns carrying numbers are skipped - near-identical prompts about
+    different listings must not share an answer - and so are turns the
+    encoder would truncate, whose tail would never be compared.
+    """
+    encoder = _get_encoder()
+    if encoder is None or message.get("role") != "user":
+        return None
+    text = _content(message)
+    if _DATA_PATTERN.search(text):
+        return None
+    # +2 for the [CLS] and [SEP] tokens the encoder adds
+    if len(encoder.tokenizer.tokenize(text)) + 2 > encoder.max_seq_length:
+        return None
+    return text
+
+
+class CachedLLM(ThrottledLLM):
+    """Throttled crewai.LLM with a per-agent response cache and prompt-prefix caching."""
+
+    def __init__(
+        self,
+        *args: Any,
+        similarity_threshold: float = SIMILARITY_THRESHOLD,
+        prompt_caching: bool = True,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.similarity_threshold = similarity_threshold
+        self.prompt_caching = prompt_caching
+
+    def _prepare_completion_params(self, messages, tools=None, skip_file_processing=False):
+        params = super()._prepare_completion_params(messages, tools, skip_file_processing)
+        if self.prompt_caching:
+            params["messages"] = _mark_cacheable(params["messages"])
+        return params
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        # Turns that execute functions or return structured models are not cached
+        if available_functions or response_model is not None:
+            return super().call(
+                messages, tools, callbacks, available_functions,
+                from_task, from_agent, response_model,
+            )
+
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+
+        agent_id = getattr(from_agent, "role", None) or "default"
+        turns = [[m.get("role"), _content(m)] for m in messages]
+        scope = cache_scope.get()
+        key = _digest([self.model, agent_id, scope, turns])
+        prefix = _digest([self.model, agent_id, scope, turns[:-1]])
+        last = messages[-1] if messages else {}
+
+        if not getattr(from_task, "retry_count", 0):
+            cached = self._lookup(key, prefix, last)
+            if cached is not None:
+                return cached
+
+        response = super().call(
+            messages, tools, callbacks, available_functions,
+            from_task, from_agent, response_model,
+        )
+        if isinstance(response, str) and response:
+            self._store(key, prefix, last, response)
+        return response
+
+    def _lookup(self, key: str, prefix: str, last: Dict[str, Any]) -> Optional[str]:
+        with _lock:
+            if key in _responses:
+                _responses.move_to_end(key)
+                return _responses[key]
+            partition = _partitions.get(prefix)
+        if partition is None:
+            return None
+
+        text = _semantic_text(last)
+        if text is None:
+            return None
+        embedding = _get_encoder().encode([text], normalize_embeddings=True)
+        with _lock:
+            if partition.index.ntotal == 0:
+                return None
+            scores, ids = partition.index.search(embedding, 1)
+            if ids[0][0] >= 0 and scores[0][0] >= self.similarity_threshold:
+                return partition.responses[ids[0][0]]
+        return None
+
+    def _store(self, key: str, prefix: str, last: Dict[str, Any], response: str) -> None:
+        text = _semantic_text(last)
+        embedding = _get_encoder().encode([text], normalize_embeddings=True) if text is not None else None
+        with _lock:
+            _responses[key] = response
+            _responses.move_to_end(key)
+            while len(_responses) > MAX_CACHED_RESPONSES:
+                _responses.popitem(last=False)
+
+            if embedding is not None:
+                partition = _partitions.get(prefix)
+                if partition is None:
+                    partition = _partitions[prefix] = _Partition(embedding.shape[1])
+                _partitions.move_to_end(prefix)
+                partition.add(embedding, response)
+                while len(_partitions) > MAX_SEMANTIC_PARTITIONS:
+                    _partitions.popitem(last=False)
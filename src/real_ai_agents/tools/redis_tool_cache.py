@@ -0,0 +1,139 @@
+"""
+Redis-backed tool cache for the Call Agent Crew.
+
+CrewAI's default CacheHandler is a per-process dict, so every worker (and
+every restart) asks Retell again for results another worker already has.
+RedisToolCache keeps tool outputs in Redis with a TTL per tool:
+
+- Check Call Status: 15s, the status changes while a call is running
+- Get Call Result: no expiry, an ended call's transcript is final
+- Make Inspection/Negotiation Call and their batch tools: never cached,
+  each one dials a phone
+
+Failed tool outputs ({"success": false, ...}) are never cached. Without
+redis-py or REDIS_URL the same TTL rules apply to an in-process cache,
+which drops expired entries when they are read and keeps at most
+MAX_LOCAL_ENTRIES, evicting the least recently used.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from crewai.agents.cache.cache_handler import CacheHandler
+from crewai.utilities.string_utils import sanitize_tool_name
+from pydantic import PrivateAttr
+
+# Redis client - install with: pip install redis
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+REDIS_URL = os.getenv("REDIS_URL")
+KEY_PREFIX = "real_ai_agents:tool_cache:"
+
+# Seconds to keep each tool's output: None = no expiry, 0 = never cache.
+# Keyed by display name; CrewAI passes the sanitized name (make_inspection_call),
+# so lookups go through sanitize_tool_name.
+TOOL_TTLS: Dict[str, Optional[int]] = {
+    "Check Call Status": 15,
+    "Get Call Result": None,
+    "Make Inspection Call": 0,
+    "Make Negotiation Call": 0,
+    "Make Inspection Calls Batch": 0,
+    "Make Negotiation Calls Batch": 0,
+}
+DEFAULT_TTL = 24 * 60 * 60
+MAX_LOCAL_ENTRIES = 1024
+
+
+def _cache_key(tool: str, input: str) -> str:
+    try:
+        input = json.dumps(json.loads(input), sort_keys=True)
+    except (TypeError, ValueError):
+        pass
+    return KEY_PREFIX + hashlib.blake2b(f"{tool}:{input}".encode()).hexdigest()
+
+
+def _succeeded(output: Any) -> bool:
+    """False for the {"success": false} JSON the Retell tools return on errors."""
+    try:
+        data = json.loads(output) if isinstance(output, str) else output
+    except ValueError:
+        return True
+    return not (isinstance(data, dict) and data.get("success") is False)
+
+
+class RedisToolCache(CacheHandler):
+    """CrewAI tool cache shared by every worker through Redis."""
+
+    url: Optional[str] = REDIS_URL
+    ttls: Dict[str, Optional[int]] = TOOL_TTLS
+
+    _client: Any = PrivateAttr(default=None)
+    _cache: "OrderedDict[str, Any]" = PrivateAttr(default_factory=OrderedDict)
+    _expires: Dict[str, float] = PrivateAttr(default_factory=dict)
+    _ttls: Dict[str, Optional[int]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        self._ttls = {sanitize_tool_name(name): ttl for name, ttl in self.ttls.items()}
+        if redis is not None and self.url:
+            self._client = redis.Redis.from_url(self.url, decode_responses=True)
+
+    def _ttl(self, tool: str) -> Optional[int]:
+        """TTL for an already sanitized tool name."""
+        return self._ttls.get(tool, DEFAULT_TTL)
+
+    def add(self, tool: str, input: str, output: Any) -> None:
+        tool = sanitize_tool_name(tool)
+        ttl = self._ttl(tool)
+        if ttl == 0 or not _succeeded(output):
+            return
+
+        key = _cache_key(tool, input)
+        if self._client is not None:
+            try:
+                self._client.set(key, json.dumps(output), ex=ttl)
+                return
+            except redis.RedisError:
+                pass  # Fall back to the in-process cache
+
+        with self._lock.w_locked():
+            self._cache[key] = output
+            self._cache.move_to_end(key)
+            self._expires[key] = time.monotonic() + ttl if ttl else math.inf
+            while len(self._cache) > MAX_LOCAL_ENTRIES:
+                oldest, _ = self._cache.popitem(last=False)
+                self._expires.pop(oldest, None)
+
+    def read(self, tool: str, input: str) -> Any | None:
+        tool = sanitize_tool_name(tool)
+        if self._ttl(tool) == 0:
+            return None
+
+        key = _cache_key(tool, input)
+        if self._client is not None:
+            try:
+                cached = self._client.get(key)
+                if cached is not None:
+                    return json.loads(cached)
+            except redis.RedisError:
+                pass
+
+        # Write lock: a hit is moved to the LRU end and an expired entry is dropped
+        with self._lock.w_locked():
+            if key not in self._cache:
+                return None
+            if self._expires.get(key, 0) > time.monotonic():
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            del self._cache[key]
+            self._expires.pop(key, None)
+        return None
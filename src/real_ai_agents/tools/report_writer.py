@@ -0,0 +1,79 @@
+"""
+Background JSON report writer for crew tasks.
+
+CrewAI's output_file writes the report on the task's thread once the LLM
+response is complete, so the next Flow step waits on the disk flush.
+report_writer(path) returns a Task callback that hands the write to a
+small background pool instead. Files are written to a temp file and
+renamed into place, so a reader never sees a half-written report.
+
+Writes are tracked per flow run (crewai's current_flow_id when the task was
+built), and flush_reports() blocks until every write queued by the current
+run has landed, so concurrent flows never wait on or drain each other's.
+"""
+
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from crewai.flow.flow_context import current_flow_id
+from crewai.tasks.task_output import TaskOutput
+
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="report-writer")
+_pending: Dict[Optional[str], List[Future]] = defaultdict(list)
+_pending_lock = threading.Lock()
+
+
+def strip_fences(raw: str) -> str:
+    """Drop a ```json ... ``` markdown fence around an LLM response."""
+    text = raw.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
+    return text
+
+
+def _write(path: str, raw: str) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # A temp file per write: two flows may write the same report concurrently
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(strip_fences(raw))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def report_writer(path: str) -> Callable[[TaskOutput], None]:
+    """Task callback that writes the task's raw output to `path` off-thread.
+
+    The write is queued under the flow run building the task; task callbacks
+    run on crew threads that do not carry the flow's context.
+    """
+    run_id = current_flow_id.get()
+
+    def write_report(output: TaskOutput) -> None:
+        future = _executor.submit(_write, path, output.raw)
+        with _pending_lock:
+            _pending[run_id].append(future)
+    return write_report
+
+
+def flush_reports(timeout: Optional[float] = None) -> None:
+    """Wait for the current flow run's queued report writes and re-raise the first failure."""
+    run_id = current_flow_id.get()
+    with _pending_lock:
+        futures = list(_pending.get(run_id, ()))
+    done, _ = wait(futures, timeout=timeout)
+    with _pending_lock:
+        remaining = [f for f in _pending.pop(run_id, ()) if f not in done]
+        if remaining:
+            _pending[run_id] = remaining
+    for future in done:
+        future.result()
@@ -9,8 +9,13 @@ API Reference: https://docs.retellai.com/api-references/create-phone-call
 
 import os
 import time
-import json
-from typing import Optional
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import httpx
+import orjson
+from typing import Any, Callable, Coroutine, Dict, List, Optional
 from crewai.tools import tool
 
 # Retell AI SDK - install with: pip install retell-sdk
@@ -26,14 +31,43 @@ RETELL_FROM_NUMBER = os.getenv("RETELL_FROM_NUMBER")  # Your Retell-purchased nu
 RETELL_INSPECTOR_AGENT_ID = os.getenv("RETELL_INSPECTOR_AGENT_ID")
 RETELL_NEGOTIATOR_AGENT_ID = os.getenv("RETELL_NEGOTIATOR_AGENT_ID")
 
+RETELL_API_BASE_URL = "https://api.retellai.com"
+POLL_INITIAL_SECONDS = 2
+POLL_MAX_SECONDS = 15
+
+
+_client_lock = threading.Lock()
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run coro to completion from a sync tool, even inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    # Already inside an event loop: run on a worker thread's own loop
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+@lru_cache(maxsize=1)
+def _build_retell_client():
+    return Retell(api_key=RETELL_API_KEY)
+
 
 def _get_retell_client():
-    """Get Retell client instance."""
+    """Get the shared Retell client instance.
+    
+    Built once per process so every tool call reuses the SDK's connection
+    pool; the lock stops parallel tool threads from racing to build it.
+    """
     if Retell is None:
         raise ImportError("retell-sdk not installed. Run: pip install retell-sdk")
     if not RETELL_API_KEY:
         raise ValueError("RETELL_API_KEY environment variable not set")
-    return Retell(api_key=RETELL_API_KEY)
+    with _client_lock:
+        return _build_retell_client()
 
 
 @tool("Make Inspection Call")
@@ -68,16 +102,16 @@ def make_inspection_call(
         client = _get_retell_client()
         
         if not RETELL_FROM_NUMBER:
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": "RETELL_FROM_NUMBER environment variable not set"
-            })
+            }).decode()
         
         if not RETELL_INSPECTOR_AGENT_ID:
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": "RETELL_INSPECTOR_AGENT_ID environment variable not set"
-            })
+            }).decode()
         
         # Create the phone call with dynamic variables for the Retell agent
         call_response = client.call.create_phone_call(
@@ -98,7 +132,7 @@ def make_inspection_call(
             }
         )
         
-        return json.dumps({
+        return orjson.dumps({
             "success": True,
             "call_id": call_response.call_id,
             "call_status": call_response.call_status,
@@ -106,15 +140,15 @@ def make_inspection_call(
             "to_number": to_number,
             "call_type": "inspection",
             "message": "Inspection call initiated successfully"
-        })
+        }).decode()
         
     except Exception as e:
-        return json.dumps({
+        return orjson.dumps({
             "success": False,
             "error": str(e),
             "property_id": property_id,
             "to_number": to_number
-        })
+        }).decode()
 
 
 @tool("Make Negotiation Call")
@@ -149,16 +183,16 @@ def make_negotiation_call(
         client = _get_retell_client()
         
         if not RETELL_FROM_NUMBER:
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": "RETELL_FROM_NUMBER environment variable not set"
-            })
+            }).decode()
         
         if not RETELL_NEGOTIATOR_AGENT_ID:
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": "RETELL_NEGOTIATOR_AGENT_ID environment variable not set"
-            })
+            }).decode()
         
         # Create the phone call with dynamic variables for the Retell agent
         call_response = client.call.create_phone_call(
@@ -179,7 +213,7 @@ def make_negotiation_call(
             }
         )
         
-        return json.dumps({
+        return orjson.dumps({
             "success": True,
             "call_id": call_response.call_id,
             "call_status": call_response.call_status,
@@ -187,112 +221,266 @@ def make_negotiation_call(
             "to_number": to_number,
             "call_type": "negotiation",
             "message": "Negotiation call initiated successfully"
-        })
+        }).decode()
         
     except Exception as e:
-        return json.dumps({
+        return orjson.dumps({
             "success": False,
             "error": str(e),
             "property_id": property_id,
             "to_number": to_number
-        })
+        }).decode()
 
 
-@tool("Get Call Result")
-def get_call_result(call_id: str, max_wait_seconds: int = 300) -> str:
+# ========================= BATCH CALLS =========================
+# One tool call starts every assigned call concurrently over Retell's REST
+# API, instead of the agent looping through the single-call tool N times.
+
+def _inspection_variables(call: Dict[str, str]) -> Dict[str, str]:
+    return {
+        "property_address": call.get("property_address", ""),
+        "property_price": call.get("property_price", ""),
+        "user_questions": call.get("user_questions", ""),
+        "contact_name": call.get("contact_name") or "the property agent",
+        "call_purpose": "schedule_inspection"
+    }
+
+
+def _negotiation_variables(call: Dict[str, str]) -> Dict[str, str]:
+    return {
+        "property_address": call.get("property_address", ""),
+        "estimated_value": call.get("estimated_value", ""),
+        "investor_budget": call.get("investor_budget", ""),
+        "contact_name": call.get("contact_name") or "the property owner",
+        "call_purpose": "acquisition_negotiation"
+    }
+
+
+async def create_phone_calls_async(
+    calls: List[Dict[str, str]],
+    agent_id: str,
+    call_type: str,
+    dynamic_variables: Callable[[Dict[str, str]], Dict[str, str]],
+) -> List[Dict[str, Any]]:
+    """Create one Retell phone call per entry in calls, all at once.
+    
+    Returns a result per call, in order, shaped like the single-call tools'
+    output; one failed call does not stop the others.
     """
-    Retrieve the result of a completed Retell AI call including transcript.
+    headers = {"Authorization": f"Bearer {RETELL_API_KEY}"}
     
-    Use this tool after initiating a call to get:
-    - Full conversation transcript with timestamps
-    - Call duration and status
-    - Recording URL (if available)
-    - Any collected data from the call
+    async with httpx.AsyncClient(base_url=RETELL_API_BASE_URL, headers=headers, timeout=30) as client:
+        async def create(call: Dict[str, str]) -> Dict[str, Any]:
+            property_id = call.get("property_id")
+            to_number = call.get("to_number")
+            try:
+                response = await client.post("/v2/create-phone-call", json={
+                    "from_number": RETELL_FROM_NUMBER,
+                    "to_number": to_number,
+                    "override_agent_id": agent_id,
+                    "retell_llm_dynamic_variables": dynamic_variables(call),
+                    "metadata": {
+                        "property_id": property_id,
+                        "call_type": call_type,
+                        "flow_phase": "engagement"
+                    }
+                })
+                response.raise_for_status()
+                call_data = orjson.loads(response.content)
+                return {
+                    "success": True,
+                    "call_id": call_data.get("call_id"),
+                    "call_status": call_data.get("call_status"),
+                    "property_id": property_id,
+                    "to_number": to_number,
+                    "call_type": call_type,
+                    "message": f"{call_type.capitalize()} call initiated successfully"
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "property_id": property_id,
+                    "to_number": to_number
+                }
+        
+        return await asyncio.gather(*(create(call) for call in calls))
+
+
+def _make_calls_batch(
+    calls: List[Dict[str, str]],
+    agent_id: Optional[str],
+    agent_id_env: str,
+    call_type: str,
+    dynamic_variables: Callable[[Dict[str, str]], Dict[str, str]],
+) -> str:
+    for value, name in (
+        (RETELL_API_KEY, "RETELL_API_KEY"),
+        (RETELL_FROM_NUMBER, "RETELL_FROM_NUMBER"),
+        (agent_id, agent_id_env),
+    ):
+        if not value:
+            return orjson.dumps({
+                "success": False,
+                "error": f"{name} environment variable not set"
+            }).decode()
+    
+    results = _run_coroutine(create_phone_calls_async(calls, agent_id, call_type, dynamic_variables))
+    return orjson.dumps(results).decode()
+
+
+@tool("Make Inspection Calls Batch")
+def make_inspection_calls_batch(calls: List[Dict[str, str]]) -> str:
+    """
+    Start several inspection booking calls at once, one per property agent.
+    
+    Prefer this over Make Inspection Call when more than one property is
+    assigned: every call is dialled concurrently in a single tool call.
     
     Args:
-        call_id: The call_id returned from make_inspection_call or make_negotiation_call
-        max_wait_seconds: Maximum time to wait for call completion (default 300s/5min)
+        calls: One object per call with the Make Inspection Call arguments:
+            to_number, property_id, property_address, property_price,
+            user_questions and optionally contact_name
     
     Returns:
-        JSON string with call transcript, duration, status, and metadata
+        JSON array with each call's call_id and initial status (or error), in order
+    """
+    return _make_calls_batch(
+        calls, RETELL_INSPECTOR_AGENT_ID, "RETELL_INSPECTOR_AGENT_ID",
+        "inspection", _inspection_variables,
+    )
+
+
+@tool("Make Negotiation Calls Batch")
+def make_negotiation_calls_batch(calls: List[Dict[str, str]]) -> str:
+    """
+    Start several acquisition negotiation calls at once, one per property owner.
+    
+    Prefer this over Make Negotiation Call when more than one property is
+    assigned: every call is dialled concurrently in a single tool call.
+    
+    Args:
+        calls: One object per call with the Make Negotiation Call arguments:
+            to_number, property_id, property_address, estimated_value,
+            investor_budget and optionally contact_name
+    
+    Returns:
+        JSON array with each call's call_id and initial status (or error), in order
+    """
+    return _make_calls_batch(
+        calls, RETELL_NEGOTIATOR_AGENT_ID, "RETELL_NEGOTIATOR_AGENT_ID",
+        "negotiation", _negotiation_variables,
+    )
+
+
+async def get_call_result_async(call_id: str, max_wait_seconds: int = 300) -> str:
+    """Poll Retell's get-call endpoint until the call ends, with exponential backoff.
+    
+    Waits start at POLL_INITIAL_SECONDS and double up to POLL_MAX_SECONDS, so
+    long calls cost a handful of requests and the event loop stays free.
+    Returns the same JSON string as the Get Call Result tool.
     """
     try:
-        client = _get_retell_client()
+        if not RETELL_API_KEY:
+            raise ValueError("RETELL_API_KEY environment variable not set")
         
-        # Poll for call completion
-        start_time = time.time()
-        poll_interval = 5  # seconds
+        headers = {"Authorization": f"Bearer {RETELL_API_KEY}"}
+        start_time = time.monotonic()
+        backoff = POLL_INITIAL_SECONDS
         
-        while True:
-            call_data = client.call.retrieve(call_id)
-            
-            # Check if call has ended (valid statuses: registered, ongoing, ended, error)
-            if call_data.call_status in ["ended", "error"]:
-                break
-            
-            # Check timeout
-            elapsed = time.time() - start_time
-            if elapsed >= max_wait_seconds:
-                return json.dumps({
-                    "success": False,
-                    "call_id": call_id,
-                    "error": f"Timeout waiting for call completion after {max_wait_seconds}s",
-                    "last_status": call_data.call_status
-                })
-            
-            time.sleep(poll_interval)
-        
-        # Get transcript and call analysis
-        transcript_text = getattr(call_data, 'transcript', None)
-        call_analysis = getattr(call_data, 'call_analysis', {})
-        
-        # Parse structured transcript with timestamps
-        structured_transcript = []
-        if hasattr(call_data, 'transcript_object') and call_data.transcript_object:
-            for utterance in call_data.transcript_object:
-                role = getattr(utterance, 'role', 'unknown')  # "agent" or "user"
-                content = getattr(utterance, 'content', '')
-                words = getattr(utterance, 'words', [])
+        async with httpx.AsyncClient(base_url=RETELL_API_BASE_URL, headers=headers, timeout=30) as client:
+            while True:
+                response = await client.get(f"/v2/get-call/{call_id}")
+                response.raise_for_status()
+                call_data = orjson.loads(response.content)
                 
-                # Get start time from first word if available
-                start_time_sec = 0
-                if words and len(words) > 0:
-                    start_time_sec = words[0].get('start', 0) if isinstance(words[0], dict) else 0
+                # Check if call has ended (valid statuses: registered, ongoing, ended, error)
+                if call_data.get("call_status") in ["ended", "error"]:
+                    break
                 
-                minutes = int(start_time_sec // 60)
-                seconds = int(start_time_sec % 60)
-                structured_transcript.append({
-                    "timestamp": f"{minutes:02d}:{seconds:02d}",
-                    "role": role,
-                    "content": content
-                })
-        
-        # Calculate duration
-        duration_seconds = None
-        if hasattr(call_data, 'start_timestamp') and hasattr(call_data, 'end_timestamp'):
-            if call_data.start_timestamp and call_data.end_timestamp:
-                duration_seconds = (call_data.end_timestamp - call_data.start_timestamp) // 1000
+                # Check timeout
+                remaining = max_wait_seconds - (time.monotonic() - start_time)
+                if remaining <= 0:
+                    return orjson.dumps({
+                        "success": False,
+                        "call_id": call_id,
+                        "error": f"Timeout waiting for call completion after {max_wait_seconds}s",
+                        "last_status": call_data.get("call_status")
+                    }).decode()
+                
+                await asyncio.sleep(min(backoff, remaining))
+                backoff = min(backoff * 2, POLL_MAX_SECONDS)
         
-        return json.dumps({
-            "success": True,
-            "call_id": call_id,
-            "call_status": call_data.call_status,
-            "duration_seconds": duration_seconds,
-            "transcript": transcript_text,
-            "structured_transcript": structured_transcript,
-            "recording_url": getattr(call_data, 'recording_url', None),
-            "call_analysis": call_analysis,
-            "metadata": getattr(call_data, 'metadata', {}),
-            "collected_variables": getattr(call_data, 'collected_dynamic_variables', {}),
-            "disconnection_reason": getattr(call_data, 'disconnection_reason', None)
-        })
+        return orjson.dumps(_format_call_result(call_id, call_data)).decode()
         
     except Exception as e:
-        return json.dumps({
+        return orjson.dumps({
             "success": False,
             "call_id": call_id,
             "error": str(e)
+        }).decode()
+
+
+def _format_call_result(call_id: str, call_data: dict) -> dict:
+    """Shape a Retell get-call response into the Get Call Result payload."""
+    # Parse structured transcript with timestamps
+    # Long calls have thousands of utterances, so the loop binds its lookups locally
+    structured_transcript = []
+    append = structured_transcript.append
+    for utterance in call_data.get("transcript_object") or []:
+        get = utterance.get
+        words = get("words")
+        
+        # Get start time from first word if available
+        first_word = words[0] if words else None
+        start_time_sec = first_word.get("start", 0) if isinstance(first_word, dict) else 0
+        
+        minutes, seconds = divmod(int(start_time_sec), 60)
+        append({
+            "timestamp": "%02d:%02d" % (minutes, seconds),
+            "role": get("role", "unknown"),  # "agent" or "user"
+            "content": get("content", "")
         })
+    
+    # Calculate duration
+    duration_seconds = None
+    if call_data.get("start_timestamp") and call_data.get("end_timestamp"):
+        duration_seconds = (call_data["end_timestamp"] - call_data["start_timestamp"]) // 1000
+    
+    return {
+        "success": True,
+        "call_id": call_id,
+        "call_status": call_data.get("call_status"),
+        "duration_seconds": duration_seconds,
+        "transcript": call_data.get("transcript"),
+        "structured_transcript": structured_transcript,
+        "recording_url": call_data.get("recording_url"),
+        "call_analysis": call_data.get("call_analysis") or {},
+        "metadata": call_data.get("metadata") or {},
+        "collected_variables": call_data.get("collected_dynamic_variables") or {},
+        "disconnection_reason": call_data.get("disconnection_reason")
+    }
+
+
+@tool("Get Call Result")
+def get_call_result(call_id: str, max_wait_seconds: int = 300) -> str:
+    """
+    Retrieve the result of a completed Retell AI call including transcript.
+    
+    Use this tool after initiating a call to get:
+    - Full conversation transcript with timestamps
+    - Call duration and status
+    - Recording URL (if available)
+    - Any collected data from the call
+    
+    Args:
+        call_id: The call_id returned from make_inspection_call or make_negotiation_call
+        max_wait_seconds: Maximum time to wait for call completion (default 300s/5min)
+    
+    Returns:
+        JSON string with call transcript, duration, status, and metadata
+    """
+    return _run_coroutine(get_call_result_async(call_id, max_wait_seconds))
 
  
 @tool("Check Call Status")
@@ -311,21 +499,21 @@ def check_call_status(call_id: str) -> str:
     """
     try:
         client = _get_retell_client()
-        call_data = client.call.retrieve(call_id)
+        status = client.call.retrieve(call_id).call_status
         
         # Valid statuses: registered, ongoing, ended, error
-        return json.dumps({
+        return orjson.dumps({
             "success": True,
             "call_id": call_id,
-            "call_status": call_data.call_status,
-            "in_progress": call_data.call_status in ["registered", "ongoing"],
-            "completed": call_data.call_status == "ended",
-            "failed": call_data.call_status == "error"
-        })
+            "call_status": status,
+            "in_progress": status in ("registered", "ongoing"),
+            "completed": status == "ended",
+            "failed": status == "error"
+        }).decode()
         
     except Exception as e:
-        return json.dumps({
+        return orjson.dumps({
             "success": False,
             "call_id": call_id,
             "error": str(e)
-        })
+        }).decode()
@@ -0,0 +1,180 @@
+"""
+Process-wide OpenRouter rate limiting for the crew LLMs.
+
+ThrottledLLM waits on a shared token bucket before each completion instead
+of sending requests blind and retrying after a 429. The bucket refills at
+REQUESTS_PER_MINUTE / TOKENS_PER_MINUTE, at most MAX_CONCURRENT_CALLS
+requests are in flight, and the request budget is corrected from
+OpenRouter's x-ratelimit-remaining-requests header. A 429 pauses every
+caller for the Retry-After interval before the request is retried.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Mapping, Optional
+
+import litellm
+from crewai import LLM
+
+
+REQUESTS_PER_MINUTE = int(os.getenv("OPENROUTER_RPM", "60"))
+TOKENS_PER_MINUTE = int(os.getenv("OPENROUTER_TPM", "200000"))
+MAX_CONCURRENT_CALLS = 6  # Keeps the parallel crews inside OpenRouter's RPM
+MAX_RATE_LIMIT_RETRIES = 3
+DEFAULT_RETRY_AFTER = 10.0  # Seconds, when a 429 carries no Retry-After
+
+
+def _header(headers: Optional[Mapping[str, Any]], name: str) -> Optional[float]:
+    """Read a numeric header, including LiteLLM's llm_provider- prefixed copy."""
+    if not headers:
+        return None
+    value = headers.get(name, headers.get(f"llm_provider-{name}"))
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket over requests and tokens per minute, shared by all agents."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_concurrent: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.requests_per_minute / 60,
+        )
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self.tokens_per_minute / 60,
+        )
+
+    def acquire(self, tokens: int) -> None:
+        """Block until a request slot and `tokens` of budget are available."""
+        tokens = min(tokens, self.tokens_per_minute)
+        self._slots.acquire()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._requests >= 1 and self._tokens >= tokens:
+                        self._requests -= 1
+                        self._tokens -= tokens
+                        return
+                    wait = max(
+                        (1 - self._requests) * 60 / self.requests_per_minute,
+                        (tokens - self._tokens) * 60 / self.tokens_per_minute,
+                    )
+            time.sleep(wait)
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds` (used on 429 Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, Any]]) -> None:
+        """Never assume more requests than OpenRouter says are left."""
+        remaining = _header(headers, "x-ratelimit-remaining-requests")
+        if remaining is None:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._requests = min(self._requests, remaining)
+
+
+rate_limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE, MAX_CONCURRENT_CALLS)
+
+
+def record_rate_limit_headers(response) -> None:
+    """httpx response hook feeding OpenRouter's rate-limit headers into the bucket.
+
+    Registered on the shared OpenRouter client: LiteLLM drops the response
+    headers on streamed completions, so callbacks never see them.
+    """
+    rate_limiter.update_from_headers(response.headers)
+
+
+def _rate_limit_error(error: BaseException) -> Optional[litellm.RateLimitError]:
+    """The RateLimitError behind error, if any.
+
+    crewai.LLM's streaming path re-raises every failure as a plain
+    Exception("Failed to get streaming response: ...") from the original.
+    """
+    while error is not None:
+        if isinstance(error, litellm.RateLimitError):
+            return error
+        error = error.__cause__
+    return None
+
+
+def _retry_after(error: litellm.RateLimitError) -> float:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "litellm_response_headers", None)
+    seconds = _header(headers, "retry-after")
+    return seconds if seconds is not None else DEFAULT_RETRY_AFTER
+
+
+class ThrottledLLM(LLM):
+    """crewai.LLM that waits on the shared OpenRouter rate limiter before each call."""
+
+    def __copy__(self) -> "ThrottledLLM":
+        # crewai.LLM.__copy__ rebuilds a plain LLM; agents copy their LLM on
+        # kickoff_for_each, so keep the subclass (the limiter is module-level).
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.additional_params = dict(self.additional_params)
+        return clone
+
+    def __deepcopy__(self, memo) -> "ThrottledLLM":
+        # additional_params carries the shared pooled HTTP client (locks and
+        # sockets), which must be shared rather than copied
+        return self.__copy__()
+
+    def _estimate_tokens(self, messages) -> int:
+        text = messages if isinstance(messages, str) else json.dumps(messages, default=str)
+        return len(text) // 4 + (self.max_tokens or 0)
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        tokens = self._estimate_tokens(messages)
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            rate_limiter.acquire(tokens)
+            try:
+                return super().call(
+                    messages, tools, callbacks, available_functions,
+                    from_task, from_agent, response_model,
+                )
+            except Exception as e:
+                rate_limit_error = _rate_limit_error(e)
+                if rate_limit_error is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                rate_limiter.pause(_retry_after(rate_limit_error))
+            finally:
+                rate_limiter.release()
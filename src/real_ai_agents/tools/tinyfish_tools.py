@@ -4,18 +4,168 @@ TinyFish Web Agent Tools for Research Crew.
 API Reference: https://docs.tinyfish.ai/
 Base URL: https://agent.tinyfish.ai/v1/automation
 Auth: X-API-Key header using TINYFISH_API_KEY env var
+
+_arun posts through a pooled httpx.AsyncClient so several extractions can
+run concurrently on one event loop; _run posts through a process-wide
+httpx.Client, so sync callers reuse its connections instead of opening a
+client and an event loop per call. Both share the request and response
+handling.
+
+Successful extractions are cached for TINYFISH_CACHE_TTL seconds, keyed by
+(url, goal, use_stealth, proxy_country), so a research retry that asks for
+the same page again doesn't pay for another browser run. The cache is kept
+in memory and, when diskcache is installed, in TINYFISH_CACHE_DIR so it
+survives restarts. Failed runs are never cached.
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import os
-import json
-import requests
-from typing import Type, Any, Dict, Optional
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+import httpx
+import orjson
+from typing import Type, Any, Dict, Optional, Tuple
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+# Persistent result cache - install with: pip install diskcache
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Lazy SIMD JSON parser - install with: pip install pysimdjson
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
 
 TINYFISH_BASE_URL = "https://agent.tinyfish.ai/v1/automation"
+TINYFISH_TIMEOUT_SECONDS = 120
+TINYFISH_CACHE_DIR = os.getenv("TINYFISH_CACHE_DIR", "/tmp/tinyfish")
+TINYFISH_CACHE_TTL = 60 * 60
+TINYFISH_CACHE_SIZE = 256
+
+_NO_API_KEY = {
+    "success": False,
+    "error": "TINYFISH_API_KEY environment variable is not set"
+}
+
+# HTTP/2 support - install with: pip install httpx[http2]
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# httpx.AsyncClient connections belong to the loop that opened them, so keep
+# one pooled client per event loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the TinyFish client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=TINYFISH_BASE_URL,
+            http2=HTTP2,
+            timeout=TINYFISH_TIMEOUT_SECONDS,
+        )
+        _clients[loop] = client
+    return client
+
+
+@lru_cache(maxsize=1)
+def _get_sync_client() -> httpx.Client:
+    """The TinyFish client shared by every sync call in the process."""
+    return httpx.Client(
+        base_url=TINYFISH_BASE_URL,
+        http2=HTTP2,
+        timeout=TINYFISH_TIMEOUT_SECONDS,
+    )
+
+
+# A simdjson.Parser reuses its buffers and invalidates the previous document on
+# each parse, so every thread gets its own and values are materialized at once.
+_parsers = threading.local()
+
+
+_JSON_OBJECT_TYPES = (dict, simdjson.Object) if simdjson is not None else (dict,)
+
+
+def _parse_response(content: bytes) -> Any:
+    """Parse a TinyFish response object; with pysimdjson nested values stay unparsed until used.
+
+    Raises ValueError (orjson.JSONDecodeError with orjson) if the body is not
+    JSON and TypeError if it is not a JSON object.
+    """
+    if simdjson is None:
+        data = orjson.loads(content)
+    else:
+        parser = getattr(_parsers, "parser", None)
+        if parser is None:
+            parser = _parsers.parser = simdjson.Parser()
+        data = parser.parse(content)
+    if not isinstance(data, _JSON_OBJECT_TYPES):
+        raise TypeError(f"expected a JSON object, got {type(data).__name__}")
+    return data
+
+
+def _materialize(value: Any) -> Any:
+    """Turn a lazy simdjson object or array into plain dicts and lists."""
+    if hasattr(value, "as_dict"):
+        return value.as_dict()
+    if hasattr(value, "as_list"):
+        return value.as_list()
+    return value
+
+
+_memory_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _disk_cache():
+    return diskcache.Cache(TINYFISH_CACHE_DIR) if diskcache is not None else None
+
+
+def _cache_key(url: str, goal: str, use_stealth: bool, proxy_country: Optional[str]) -> str:
+    proxy = proxy_country.upper() if proxy_country else ""
+    return hashlib.blake2b(f"{url}|{goal}|{use_stealth}|{proxy}".encode()).hexdigest()
+
+
+def _cached_result(key: str) -> Optional[str]:
+    """Cached extraction JSON for key, or None if missing or expired."""
+    with _cache_lock:
+        entry = _memory_cache.get(key)
+        if entry is not None:
+            expires, result = entry
+            if expires > time.monotonic():
+                _memory_cache.move_to_end(key)
+                return result
+            del _memory_cache[key]
+
+    disk = _disk_cache()
+    return disk.get(key) if disk is not None else None
+
+
+def _store_result(key: str, result: str) -> None:
+    with _cache_lock:
+        _memory_cache[key] = (time.monotonic() + TINYFISH_CACHE_TTL, result)
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > TINYFISH_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+    disk = _disk_cache()
+    if disk is not None:
+        disk.set(key, result, expire=TINYFISH_CACHE_TTL)
 
 
 class TinyFishExtractorInput(BaseModel):
@@ -67,71 +217,126 @@ class TinyFishExtractorTool(BaseTool):
         use_stealth: bool = False,
         proxy_country: Optional[str] = None,
     ) -> str:
-        api_key = os.getenv("TINYFISH_API_KEY")
-        if not api_key:
-            return json.dumps({
-                "success": False,
-                "error": "TINYFISH_API_KEY environment variable is not set"
-            })
+        key = _cache_key(url, goal, use_stealth, proxy_country)
+        cached = _cached_result(key)
+        if cached is not None:
+            return cached
 
-        body: Dict[str, Any] = {"url": url, "goal": goal}
-
-        if use_stealth:
-            body["browser_profile"] = "stealth"
+        request = _build_request(url, goal, use_stealth, proxy_country)
+        if request is None:
+            return _finish(key, _NO_API_KEY)
+        try:
+            payload = _run_payload(_get_sync_client().post("/run", **request), url)
+        except (httpx.HTTPError, ValueError, TypeError) as e:
+            payload = _request_failed(e, url)
+        return _finish(key, payload)
 
-        if proxy_country:
-            body["proxy_config"] = {
-                "enabled": True,
-                "country_code": proxy_country.upper(),
-            }
+    async def _arun(
+        self,
+        url: str,
+        goal: str,
+        use_stealth: bool = False,
+        proxy_country: Optional[str] = None,
+    ) -> str:
+        key = _cache_key(url, goal, use_stealth, proxy_country)
+        cached = _cached_result(key)
+        if cached is not None:
+            return cached
 
+        request = _build_request(url, goal, use_stealth, proxy_country)
+        if request is None:
+            return _finish(key, _NO_API_KEY)
         try:
-            response = requests.post(
-                f"{TINYFISH_BASE_URL}/run",
-                headers={
-                    "X-API-Key": api_key,
-                    "Content-Type": "application/json",
-                },
-                json=body,
-                timeout=120,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            status = data.get("status", "")
-
-            if status == "COMPLETED":
-                result = data.get("result")
-                if result is not None:
-                    return json.dumps({"success": True, "data": result, "url": url})
-                return json.dumps({
-                    "success": False,
-                    "error": "Run completed but no result data returned",
-                    "url": url,
-                })
-
-            if status == "FAILED":
-                error_info = data.get("error", {})
-                error_message = (
-                    error_info.get("message", "Unknown error")
-                    if isinstance(error_info, dict)
-                    else str(error_info)
-                )
-                return json.dumps({
-                    "success": False,
-                    "error": f"TinyFish run failed: {error_message}",
-                    "url": url,
-                })
-
-            return json.dumps({
-                "success": False,
-                "error": f"Unexpected run status: {status}",
-                "url": url,
-            })
-
-        except requests.exceptions.RequestException as e:
-            return json.dumps({
-                "success": False,
-                "error": f"TinyFish API request failed: {str(e)}",
-                "url": url,
-            })
+            payload = _run_payload(await _get_client().post("/run", **request), url)
+        except (httpx.HTTPError, ValueError, TypeError) as e:
+            payload = _request_failed(e, url)
+        return _finish(key, payload)
+
+
+def _build_request(
+    url: str,
+    goal: str,
+    use_stealth: bool,
+    proxy_country: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """Keyword arguments for POST /run, or None when no API key is set."""
+    api_key = os.getenv("TINYFISH_API_KEY")
+    if not api_key:
+        return None
+
+    body: Dict[str, Any] = {"url": url, "goal": goal}
+
+    if use_stealth:
+        body["browser_profile"] = "stealth"
+
+    if proxy_country:
+        body["proxy_config"] = {
+            "enabled": True,
+            "country_code": proxy_country.upper(),
+        }
+
+    return {
+        "headers": {
+            "X-API-Key": api_key,
+            "Content-Type": "application/json",
+        },
+        "json": body,
+    }
+
+
+def _run_payload(response: httpx.Response, url: str) -> Dict[str, Any]:
+    """Tool payload for a /run response.
+
+    Raises httpx.HTTPStatusError on an error status, and ValueError or
+    TypeError when the body is not a JSON object.
+    """
+    response.raise_for_status()
+    data = _parse_response(response.content)
+
+    status = data.get("status", "")
+
+    if status == "COMPLETED":
+        result = data.get("result")
+        if result is not None:
+            return {"success": True, "data": _materialize(result), "url": url}
+        return {
+            "success": False,
+            "error": "Run completed but no result data returned",
+            "url": url,
+        }
+
+    if status == "FAILED":
+        error_info = _materialize(data.get("error", {}))
+        error_message = (
+            error_info.get("message", "Unknown error")
+            if isinstance(error_info, dict)
+            else str(error_info)
+        )
+        return {
+            "success": False,
+            "error": f"TinyFish run failed: {error_message}",
+            "url": url,
+        }
+
+    return {
+        "success": False,
+        "error": f"Unexpected run status: {status}",
+        "url": url,
+    }
+
+
+def _request_failed(error: Exception, url: str) -> Dict[str, Any]:
+    # Transport and HTTP errors, and bodies that are not a JSON object
+    return {
+        "success": False,
+        "error": f"TinyFish API request failed: {str(error)}",
+        "url": url,
+    }
+
+
+def _finish(key: str, payload: Dict[str, Any]) -> str:
+    """Serialize payload, caching it if the run succeeded."""
+    result = orjson.dumps(payload).decode()
+    if payload.get("success"):
+        _store_result(key, result)
+    return result
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+
+import httpx
+import pytest
+
+# Keep CrewAI's telemetry and flow-persistence SQLite out of the test run
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_TRACING_ENABLED", "false")
+os.environ.setdefault("XDG_DATA_HOME", tempfile.mkdtemp(prefix="real_ai_agents-tests-"))
+
+
+def sse_response(text: str = "ok", headers=None) -> httpx.Response:
+    """A streamed chat completion, the way OpenRouter sends it with stream=True."""
+    chunks = [
+        {"id": "gen-1", "object": "chat.completion.chunk", "created": 1, "model": "m",
+         "choices": [{"index": 0, "delta": {"role": "assistant", "content": text}, "finish_reason": None}]},
+        {"id": "gen-1", "object": "chat.completion.chunk", "created": 1, "model": "m",
+         "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+         "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6}},
+    ]
+    body = b"".join(b"data: " + json.dumps(c).encode() + b"\n\n" for c in chunks) + b"data: [DONE]\n\n"
+    return httpx.Response(200, headers={"content-type": "text/event-stream", **(headers or {})}, content=body)
+
+
+class FakeOpenRouter:
+    """MockTransport handler: records requests and replays queued responses."""
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.responses.pop(0) if self.responses else sse_response()
+
+
+def _clear_llm_caches():
+    from real_ai_agents import llms
+
+    for factory in (llms.http_client, llms.llm_fast, llms.llm_default, llms.llm_reasoner):
+        factory.cache_clear()
+
+
+@pytest.fixture
+def openrouter(monkeypatch):
+    """Point the shared OpenRouter client at a FakeOpenRouter."""
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    fake = FakeOpenRouter()
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        httpx, "Client", lambda **kwargs: real_client(transport=httpx.MockTransport(fake), **kwargs)
+    )
+    _clear_llm_caches()
+    yield fake
+    _clear_llm_caches()
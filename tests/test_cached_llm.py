@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from crewai import Task
+
+from real_ai_agents import llms
+from real_ai_agents.tools import cached_llm
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    cached_llm._responses.clear()
+    cached_llm._partitions.clear()
+    yield
+    cached_llm._responses.clear()
+    cached_llm._partitions.clear()
+
+
+def _listing_prompt(price: int) -> str:
+    # The differing price sits far past MiniLM's 256-token window
+    return "Summarise this listing. " + "Spacious family home with a garden. " * 80 + f"Price: ${price}"
+
+
+def test_identical_prompt_is_served_from_the_cache(openrouter):
+    llm = llms.llm_default()
+
+    assert llm.call("test_cached_llm: reply with ok") == "ok"
+    assert llm.call("test_cached_llm: reply with ok") == "ok"
+    assert len(openrouter.requests) == 1
+
+
+def test_prompts_differing_only_in_their_data_are_not_shared(openrouter):
+    llm = llms.llm_default()
+
+    llm.call(_listing_prompt(450000))
+    llm.call(_listing_prompt(975000))
+    assert len(openrouter.requests) == 2
+
+
+def test_guardrail_retry_skips_the_cache(openrouter):
+    llm = llms.llm_default()
+
+    task = Task(description="Reply with ok", expected_output="ok")
+
+    llm.call("test_cached_llm: reply with ok", from_task=task)
+    task.retry_count = 1
+    llm.call("test_cached_llm: reply with ok", from_task=task)
+    assert len(openrouter.requests) == 2
+
+
+def test_least_recently_used_response_is_evicted(openrouter, monkeypatch):
+    monkeypatch.setattr(cached_llm, "MAX_CACHED_RESPONSES", 1)
+    llm = llms.llm_default()
+
+    llm.call("test_cached_llm: first")
+    llm.call("test_cached_llm: second")
+    llm.call("test_cached_llm: first")
+    assert len(openrouter.requests) == 3
+    assert len(cached_llm._responses) == 1
+
+
+def test_responses_are_not_shared_across_cache_scopes(openrouter):
+    llm = llms.llm_default()
+
+    llm.call("test_cached_llm: reply with ok")
+    token = cached_llm.cache_scope.set("research-retry-1")
+    try:
+        llm.call("test_cached_llm: reply with ok")
+        llm.call("test_cached_llm: reply with ok")
+    finally:
+        cached_llm.cache_scope.reset(token)
+    llm.call("test_cached_llm: reply with ok")
+
+    assert len(openrouter.requests) == 2
+
+
+def test_research_retry_runs_in_its_own_cache_scope(monkeypatch, tmp_path):
+    from real_ai_agents import crews, main
+
+    monkeypatch.chdir(tmp_path)
+    scopes = []
+
+    class FakeResearchCrew:
+        def crew(self):
+            return self
+
+        async def kickoff_async(self, inputs):
+            return None
+
+    async def drain(streaming, label):
+        scopes.append(cached_llm.cache_scope.get())
+        return [SimpleNamespace(raw='{"properties": []}')]
+
+    monkeypatch.setattr(crews, "ResearchCrew", FakeResearchCrew, raising=False)
+    monkeypatch.setattr(main, "_adrain_stream", drain)
+    flow = main.RealEstateFlow()
+    flow.state.search_query = "2 bedroom apartment in Lagos"
+
+    asyncio.run(flow.run_research())
+    flow.state.retry_count = 1
+    asyncio.run(flow.run_research())
+
+    assert scopes == ["", "research-retry-1"]
+    assert cached_llm.cache_scope.get() == ""
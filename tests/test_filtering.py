@@ -0,0 +1,73 @@
+import orjson
+import pytest
+
+from real_ai_agents import main
+
+RESEARCH = {
+    "location": "Lagos",
+    "properties": [
+        {"id": "p1", "price": 450000.5, "address": "1 Marina"},
+        {"id": "p2", "price": 300000},
+        {"id": "p1", "price": 455000, "address": "1 Marina (relisted)"},
+    ],
+    "summary": {"count": 3},
+}
+
+
+@pytest.fixture(params=["ijson", "orjson"])
+def parser(request, monkeypatch):
+    if request.param == "orjson":
+        monkeypatch.setattr(main, "ijson", None)
+    elif main.ijson is None:
+        pytest.skip("ijson is not installed")
+    return request.param
+
+
+def test_filter_keeps_every_listing_with_an_approved_id(parser):
+    filtered, kept = main._filter_approved_listings(orjson.dumps(RESEARCH).decode(), {"p1"})
+
+    assert kept == 2
+    assert orjson.loads(filtered) == {
+        **RESEARCH,
+        "properties": [RESEARCH["properties"][0], RESEARCH["properties"][2]],
+    }
+
+
+def test_ijson_and_orjson_paths_agree(monkeypatch):
+    if main.ijson is None:
+        pytest.skip("ijson is not installed")
+    raw = orjson.dumps(RESEARCH).decode()
+
+    streamed = main._filter_approved_listings(raw, {"p1", "p2"})
+    monkeypatch.setattr(main, "ijson", None)
+    loaded = main._filter_approved_listings(raw, {"p1", "p2"})
+
+    assert orjson.loads(streamed[0]) == orjson.loads(loaded[0])
+    assert streamed[1] == loaded[1] == 3
+
+
+def test_both_listing_keys_are_filtered_the_same_way(parser):
+    research = {
+        "listings": [{"id": "p1"}, {"id": "p3"}],
+        "properties": [{"id": "p2"}, {"id": "p1"}, {"id": "p4"}],
+    }
+
+    filtered, kept = main._filter_approved_listings(orjson.dumps(research).decode(), {"p1", "p2"})
+    selected, selected_kept = main._select_approved(research, {"p1", "p2"})
+
+    expected = {"listings": [{"id": "p1"}], "properties": [{"id": "p2"}, {"id": "p1"}]}
+    assert orjson.loads(filtered) == selected == expected
+    assert kept == selected_kept == 2
+
+
+@pytest.mark.parametrize("feedback, expected", [
+    ('["prop_001", "prop_002"]', ["prop_001", "prop_002"]),
+    ("['prop_001','prop_002']", ["prop_001", "prop_002"]),
+    ('"prop_001"', ["prop_001"]),
+    ("prop_001", ["prop_001"]),
+    ("p1, p2", ["p1", "p2"]),
+    ("p1 p2,p3", ["p1", "p2", "p3"]),
+    ("[prop_001, prop_002]", ["prop_001", "prop_002"]),
+])
+def test_parse_approved_ids(feedback, expected):
+    assert main._parse_approved_ids(feedback) == expected
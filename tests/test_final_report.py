@@ -0,0 +1,48 @@
+import orjson
+import pytest
+
+from real_ai_agents.main import RealEstateFlow, SearchCriteria
+
+
+@pytest.fixture
+def flow(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "output").mkdir()
+    flow = RealEstateFlow()
+    flow.state.search_criteria = SearchCriteria(location="Lagos")
+    return flow
+
+
+def _written_report():
+    with open("output/unified_report.json", "rb") as f:
+        return orjson.loads(f.read())
+
+
+def test_report_keeps_state_lists_and_dicts(flow):
+    research = {"properties": [{"id": "p1"}, {"id": "p2"}]}
+    flow.state.research_results = orjson.dumps(research).decode()
+    flow.state.research_data = research
+    flow.state.approved_property_ids = ["p1"]
+    flow.state.properties_approved = 1
+    flow.state.call_results = '```json\n[{"call_id": "c1"}]\n```'
+    flow.state.location_results = "not json"
+
+    returned = flow.compile_final_report()
+    written = _written_report()
+
+    assert written["approved_property_ids"] == ["p1"]
+    assert written["phases"] == {
+        "research": research,
+        "calls": [{"call_id": "c1"}],
+        "location": "not json",
+    }
+    assert written == returned
+
+
+def test_report_parses_research_text_without_research_data(flow):
+    flow.state.research_results = '{"listings": [{"id": "p1"}]}'
+    flow.state.properties_approved = 1
+
+    flow.compile_final_report()
+
+    assert _written_report()["phases"]["research"] == {"listings": [{"id": "p1"}]}
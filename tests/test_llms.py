@@ -0,0 +1,16 @@
+from real_ai_agents import llms
+
+
+def test_openrouter_calls_go_through_the_shared_client(openrouter):
+    llm = llms.llm_default()
+
+    assert llm.additional_params["client"] is llms.http_client()
+    assert llm.call("test_llms: reply with ok") == "ok"
+    assert [r.url.path for r in openrouter.requests] == ["/api/v1/chat/completions"]
+
+
+def test_every_tier_shares_one_client(openrouter):
+    tiers = (llms.llm_fast, llms.llm_default, llms.llm_reasoner)
+    clients = {id(tier().additional_params["client"]) for tier in tiers}
+
+    assert clients == {id(llms.http_client())}
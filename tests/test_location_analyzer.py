@@ -0,0 +1,73 @@
+import json
+from types import SimpleNamespace
+
+import httpx
+
+from real_ai_agents.crews.location_analyzer_crew import location_analyzer_crew as lac
+
+
+def _place(place_id, distance):
+    return {"place_id": place_id, "name": place_id, "distance_meters": distance}
+
+
+def test_prefetch_searches_every_place_type_of_a_category(monkeypatch):
+    searched = []
+
+    def nearby(latitude, longitude, category):
+        searched.append(category)
+        return {
+            "grocery_store": [_place("shoprite", 900.0), _place("corner-shop", 150.0)],
+            "supermarket": [_place("shoprite", 900.0), _place("spar", 400.0)],
+        }.get(category, [])
+
+    monkeypatch.setattr(lac, "google_places_geocode_tool", SimpleNamespace(
+        run=lambda address: {"success": True, "latitude": 6.45, "longitude": 3.4},
+    ))
+    monkeypatch.setattr(lac, "google_places_nearby_tool", SimpleNamespace(run=nearby))
+
+    data = lac._prefetch_location_data({"address": "1 Marina, Lagos"})
+
+    assert searched == [t for types in lac.AMENITY_PLACE_TYPES.values() for t in types]
+    assert [p["place_id"] for p in data["nearby"]["markets"]] == ["corner-shop", "spar", "shoprite"]
+    assert data["api_errors"] == []
+
+
+def test_batch_failure_falls_back_to_per_property_runs(openrouter, monkeypatch):
+    monkeypatch.setattr(lac, "_prefetch_location_data", lambda prop: {"property": prop})
+    openrouter.responses.append(httpx.Response(500, json={"error": {"message": "upstream error"}}))
+
+    analyses = lac.LocationAnalyzerCrew().analyze_properties_batch([{"id": "p1"}, {"id": "p2"}])
+
+    assert analyses == [None, None]
+
+
+def _analysis(**overrides):
+    analysis = {
+        "property_id": "p1",
+        "coordinates": {"lat": 6.45, "lng": 3.4},
+        "amenities": {category: {"score": 80} for category in lac.AMENITY_PLACE_TYPES},
+        "overall_score": 80,
+        "advantages": [],
+        "disadvantages": [],
+    }
+    return {**analysis, **overrides}
+
+
+def test_malformed_batch_entries_fall_back_to_per_property_runs(openrouter, monkeypatch):
+    from conftest import sse_response
+
+    monkeypatch.setattr(lac, "_prefetch_location_data", lambda prop: {"property": prop})
+    batch = {
+        "p1": _analysis(),
+        "p2": _analysis(property_id="p2", coordinates=None),
+        "p3": _analysis(property_id="p3", amenities=None),
+        "p4": _analysis(property_id="p4", amenities={"markets": 80}),
+    }
+    openrouter.responses.append(sse_response(json.dumps(batch)))
+
+    analyses = lac.LocationAnalyzerCrew().analyze_properties_batch(
+        [{"id": pid} for pid in ("p1", "p2", "p3", "p4")]
+    )
+
+    assert json.loads(analyses[0]) == batch["p1"]
+    assert analyses[1:] == [None, None, None]
@@ -0,0 +1,48 @@
+import pytest
+
+from real_ai_agents.tools import redis_tool_cache
+from real_ai_agents.tools.redis_tool_cache import RedisToolCache
+
+
+@pytest.fixture
+def cache():
+    return RedisToolCache(url=None)
+
+
+def test_expired_entry_is_dropped_on_read(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(redis_tool_cache.time, "monotonic", lambda: now[0])
+    cache.add("check_call_status", '{"call_id": "c1"}', '{"status": "ongoing"}')
+
+    assert cache.read("check_call_status", '{"call_id": "c1"}') == '{"status": "ongoing"}'
+    now[0] += 16
+    assert cache.read("check_call_status", '{"call_id": "c1"}') is None
+    assert len(cache._cache) == len(cache._expires) == 0
+
+
+def test_local_cache_evicts_the_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(redis_tool_cache, "MAX_LOCAL_ENTRIES", 2)
+    cache.add("get_call_result", '{"call_id": "c1"}', "one")
+    cache.add("get_call_result", '{"call_id": "c2"}', "two")
+    cache.read("get_call_result", '{"call_id": "c1"}')
+    cache.add("get_call_result", '{"call_id": "c3"}', "three")
+
+    assert cache.read("get_call_result", '{"call_id": "c1"}') == "one"
+    assert cache.read("get_call_result", '{"call_id": "c2"}') is None
+    assert cache.read("get_call_result", '{"call_id": "c3"}') == "three"
+    assert len(cache._expires) == 2
+
+
+def test_call_tools_and_failures_are_never_cached(cache):
+    cache.add("make_inspection_call", '{"to_number": "+1"}', '{"success": true}')
+    cache.add("get_call_result", '{"call_id": "c1"}', '{"success": false, "error": "not found"}')
+
+    assert cache.read("make_inspection_call", '{"to_number": "+1"}') is None
+    assert cache.read("get_call_result", '{"call_id": "c1"}') is None
+
+
+def test_dial_tools_are_never_cached_under_any_name(cache):
+    for tool in ("Make Negotiation Call", "make_negotiation_call", "make_negotiation_calls_batch"):
+        cache.add(tool, '{"to_number": "+1"}', '{"success": true, "call_id": "c1"}')
+        assert cache.read(tool, '{"to_number": "+1"}') is None
+    assert len(cache._cache) == 0
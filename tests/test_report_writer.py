@@ -0,0 +1,60 @@
+import contextvars
+import subprocess
+import sys
+import threading
+
+from crewai.flow.flow_context import current_flow_id
+
+from real_ai_agents.tools import report_writer as rw
+
+
+class _Output:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+def _in_run(run_id, fn, *args):
+    ctx = contextvars.copy_context()
+    ctx.run(current_flow_id.set, run_id)
+    return ctx.run(fn, *args)
+
+
+def test_flush_only_waits_on_the_current_runs_writes(tmp_path, monkeypatch):
+    release = threading.Event()
+    real_write = rw._write
+
+    def write(path, raw):
+        if raw == "slow":
+            release.wait(5)
+        real_write(path, raw)
+
+    monkeypatch.setattr(rw, "_write", write)
+    slow = _in_run("flow-a", rw.report_writer, str(tmp_path / "a.json"))
+    fast = _in_run("flow-b", rw.report_writer, str(tmp_path / "b.json"))
+
+    slow(_Output("slow"))
+    fast(_Output('{"b": 1}'))
+    # flow-b's flush must not block on flow-a's queued write
+    flushed = threading.Thread(target=_in_run, args=("flow-b", rw.flush_reports, 1))
+    flushed.start()
+    flushed.join(2)
+    finished_first = not flushed.is_alive()
+    release.set()
+    flushed.join()
+
+    assert finished_first
+    assert (tmp_path / "b.json").read_text() == '{"b": 1}'
+    assert "flow-a" in rw._pending and "flow-b" not in rw._pending
+    _in_run("flow-a", rw.flush_reports)
+    assert "flow-a" not in rw._pending
+
+
+def test_flow_module_does_not_import_the_tools():
+    # A fresh interpreter: other tests have already imported the crews
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, real_ai_agents.main; print(sorted(sys.modules))"],
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+    assert "real_ai_agents.tools.retell_tools" not in loaded
+    assert "real_ai_agents.crews.research_crew" not in loaded
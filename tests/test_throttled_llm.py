@@ -0,0 +1,44 @@
+import httpx
+
+from real_ai_agents import llms
+from real_ai_agents.tools import throttled_llm
+from real_ai_agents.tools.throttled_llm import ThrottledLLM
+
+
+def _llm() -> ThrottledLLM:
+    return ThrottledLLM(
+        model="openrouter/openai/gpt-4o-mini",
+        base_url=llms.OPENROUTER_BASE_URL,
+        stream=True,
+        client=llms.http_client(),
+    )
+
+
+def test_429_pauses_and_retries(openrouter, monkeypatch):
+    pauses, remaining = [], []
+    monkeypatch.setattr(throttled_llm.rate_limiter, "pause", pauses.append)
+    monkeypatch.setattr(
+        throttled_llm.rate_limiter, "update_from_headers",
+        lambda headers: remaining.append(headers.get("x-ratelimit-remaining-requests")),
+    )
+    openrouter.responses.append(httpx.Response(
+        429,
+        headers={"retry-after": "0", "x-ratelimit-remaining-requests": "0"},
+        json={"error": {"message": "Rate limit exceeded", "code": 429}},
+    ))
+
+    assert _llm().call("test_throttled_llm: reply with ok") == "ok"
+    assert len(openrouter.requests) == 2
+    assert pauses == [0.0]
+    assert remaining == ["0", None]
+
+
+def test_streamed_response_headers_reach_the_limiter(openrouter, monkeypatch):
+    from conftest import sse_response
+
+    seen = []
+    monkeypatch.setattr(throttled_llm.rate_limiter, "update_from_headers", seen.append)
+    openrouter.responses.append(sse_response(headers={"x-ratelimit-remaining-requests": "7"}))
+
+    assert _llm().call("test_throttled_llm: reply with ok") == "ok"
+    assert [h.get("x-ratelimit-remaining-requests") for h in seen] == ["7"]
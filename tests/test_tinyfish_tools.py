@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from real_ai_agents.tools import tinyfish_tools
+from real_ai_agents.tools.tinyfish_tools import TinyFishExtractorTool
+
+
+@pytest.fixture
+def tinyfish(monkeypatch):
+    """Route TinyFish requests to a queue of canned responses."""
+    monkeypatch.setenv("TINYFISH_API_KEY", "test-key")
+    monkeypatch.setattr(tinyfish_tools, "_disk_cache", lambda: None)
+    tinyfish_tools._memory_cache.clear()
+    tinyfish_tools._get_sync_client.cache_clear()
+    responses = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    for name in ("Client", "AsyncClient"):
+        real_client = getattr(httpx, name)
+        monkeypatch.setattr(httpx, name, lambda real_client=real_client, **kwargs: real_client(
+            transport=httpx.MockTransport(handler), **kwargs,
+        ))
+    yield responses
+    tinyfish_tools._memory_cache.clear()
+    tinyfish_tools._get_sync_client.cache_clear()
+
+
+def _completed(result) -> httpx.Response:
+    return httpx.Response(200, json={"status": "COMPLETED", "result": result})
+
+
+def _extract(url="https://example.com/listings"):
+    return orjson.loads(TinyFishExtractorTool()._run(url=url, goal="Extract listings"))
+
+
+def test_completed_run_returns_the_result(tinyfish):
+    tinyfish.append(_completed({"listings": [1]}))
+
+    assert _extract() == {"success": True, "data": {"listings": [1]}, "url": "https://example.com/listings"}
+
+
+def test_sync_calls_share_one_client(tinyfish):
+    tinyfish.extend([_completed({"page": 1}), _completed({"page": 2})])
+
+    _extract("https://example.com/1")
+    client = tinyfish_tools._get_sync_client()
+    _extract("https://example.com/2")
+
+    assert tinyfish_tools._get_sync_client() is client
+    assert not client.is_closed
+    assert tinyfish == []
+
+
+def test_async_run_matches_sync_run(tinyfish):
+    tinyfish.append(_completed({"listings": [1]}))
+
+    result = asyncio.run(TinyFishExtractorTool()._arun(url="https://example.com/listings", goal="Extract listings"))
+
+    assert orjson.loads(result) == {"success": True, "data": {"listings": [1]}, "url": "https://example.com/listings"}
+
+
+def test_missing_api_key_is_reported(tinyfish, monkeypatch):
+    monkeypatch.delenv("TINYFISH_API_KEY")
+
+    assert _extract() == {"success": False, "error": "TINYFISH_API_KEY environment variable is not set"}
+
+
+@pytest.mark.parametrize("body", [b"<html>Bad gateway</html>", b"[]", b"null"])
+def test_non_object_body_is_reported_as_a_failed_request(tinyfish, body):
+    tinyfish.append(httpx.Response(200, content=body))
+
+    result = _extract()
+
+    assert result["success"] is False
+    assert result["error"].startswith("TinyFish API request failed: ")